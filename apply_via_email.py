@@ -1,19 +1,132 @@
-
-import os, smtplib
+import hashlib, os, smtplib
 from email.message import EmailMessage
 from pathlib import Path
+from typing import NamedTuple, Optional
 
 GMAIL_USER = os.getenv("GMAIL_USER")
 GMAIL_APP_PASSWORD = os.getenv("GMAIL_APP_PASSWORD")
 
-def send_application(job, cv_path: Path):
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
+SMTP_SSL = os.getenv("SMTP_SSL", "1") == "1"
+SMTP_TIMEOUT = 30
+
+# Errors after which the session is reopened and the message sent again.
+_DROPPED = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+class SendResult(NamedTuple):
+    job: dict
+    cv_path: Path
+    ok: bool
+    error: Optional[Exception] = None
+
+
+def build_message(job, cv_path: Path, key=None) -> EmailMessage:
+    """``key`` fixes the Message-ID, so a resent copy threads with the first."""
     msg = EmailMessage()
     msg["Subject"] = f"{job['title']} – application"
     msg["From"] = GMAIL_USER
     msg["To"] = job.get("apply_email") or "hiring@example.com"
+    if key:
+        domain = (GMAIL_USER or "localhost").rpartition("@")[2]
+        msg["Message-ID"] = f"<{hashlib.sha1(key.encode()).hexdigest()}@{domain}>"
     msg.set_content(f"Hi,\n\nPlease find my CV attached for {job['title']} at {job['company']}.\n\nBest regards")
+    cv_path = Path(cv_path)
     with open(cv_path, "rb") as f:
         msg.add_attachment(f.read(), maintype="application", subtype="octet-stream", filename=cv_path.name)
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465) as smtp:
-        smtp.login(GMAIL_USER, GMAIL_APP_PASSWORD)
-        smtp.send_message(msg)
+    return msg
+
+
+class Mailer:
+    """One authenticated SMTP session reused across messages.
+
+    The connection is opened on the first send and reopened (with a fresh
+    login) if the server drops it between messages.
+    """
+
+    def __init__(self, host=None, port=None, user=None, password=None, use_ssl=None, timeout=SMTP_TIMEOUT):
+        self.host = host or SMTP_HOST
+        self.port = port or SMTP_PORT
+        self.user = GMAIL_USER if user is None else user
+        self.password = GMAIL_APP_PASSWORD if password is None else password
+        self.use_ssl = SMTP_SSL if use_ssl is None else use_ssl
+        self.timeout = timeout
+        self._smtp = None
+
+    def _connect(self):
+        cls = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        smtp = cls(self.host, self.port, timeout=self.timeout)
+        if self.user and self.password:
+            smtp.login(self.user, self.password)
+        self._smtp = smtp
+
+    def _drop(self):
+        smtp, self._smtp = self._smtp, None
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                smtp.close()
+
+    def send(self, msg: EmailMessage, reconnects: int = 1):
+        for attempt in range(reconnects + 1):
+            if self._smtp is None:
+                self._connect()
+            try:
+                return self._smtp.send_message(msg)
+            except _DROPPED:
+                self._drop()
+                if attempt == reconnects:
+                    raise
+
+    def close(self):
+        self._drop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def send_applications(pairs, mailer=None, on_result=None):
+    """Email every ``(job, cv_path)`` over one session; return a SendResult per pair.
+
+    ``on_result`` is called with each SendResult as soon as it is known, so
+    callers can record progress before the batch finishes. A login failure
+    ends the batch: the remaining pairs fail with the same error instead of
+    retrying the login once per message.
+    """
+    results = []
+    owned = mailer is None
+    mailer = mailer or Mailer()
+
+    def record(result):
+        results.append(result)
+        if on_result is not None:
+            on_result(result)
+
+    try:
+        pairs = list(pairs)
+        for n, (job, cv_path) in enumerate(pairs):
+            try:
+                mailer.send(build_message(job, cv_path, key=job.get("link")))
+            except smtplib.SMTPAuthenticationError as exc:
+                for job, cv_path in pairs[n:]:
+                    record(SendResult(job, cv_path, False, exc))
+                break
+            except (smtplib.SMTPException, OSError) as exc:
+                record(SendResult(job, cv_path, False, exc))
+            else:
+                record(SendResult(job, cv_path, True))
+    finally:
+        if owned:
+            mailer.close()
+    return results
+
+
+def send_application(job, cv_path: Path):
+    result = send_applications([(job, cv_path)])[0]
+    if result.error is not None:
+        raise result.error
@@ -0,0 +1,266 @@
+"""Offline benchmark for the job search pipeline.
+
+Replays the card templates in ``benchmarks/fixtures`` for every provider in
+``job_search.SCRAPERS`` at scaled sizes and times each stage:
+
+    parse  - the provider's scrape_* function on the replayed body
+    filter - title_is_allowed plus the location check
+    dedup  - canonical_url and the seen-set lookup
+
+``--compare-parsers`` repeats the HTML providers under every available
+BeautifulSoup backend, with and without the card-only fast path.
+
+Results are written as JSON so two commits can be compared, e.g.
+
+    python benchmarks/bench_search.py --sizes 100,10000 --output bench.json
+"""
+
+import argparse
+import gc
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import types
+from pathlib import Path
+from unittest import mock
+
+ROOT = Path(__file__).resolve().parents[1]
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+sys.path.insert(0, str(ROOT))
+
+# The network layer is never exercised here, so, like tests/test_job_search.py,
+# allow running without requests installed.
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import job_search  # noqa: E402
+
+DEFAULT_SIZES = (100, 10_000, 100_000)
+KEYWORD = "product manager"
+
+TITLES = [
+    "Product Manager",
+    "Senior Software Engineer",
+    "Staff Product Manager",
+    "Product Designer",
+    "Principal Product Manager, Payments",
+    "Data Scientist",
+    "Group Product Manager",
+    "Product Owner",
+]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Wix", "Monday", "Fiverr"]
+LOCATIONS = ["Tel Aviv, Israel", "Haifa, Israel", "Remote, Israel", "Berlin, Germany"]
+
+
+def _html_page(cards):
+    return "<html><body><div id='results'>" + "".join(cards) + "</div></body></html>"
+
+
+def _rss_page(items):
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        "<title>Jobs</title>" + "".join(items) + "</channel></rss>"
+    )
+
+
+def _json_page(key):
+    def wrap(items):
+        return '{"next": null, "%s": [%s]}' % (key, ",".join(items))
+    return wrap
+
+
+# scrape_* function name -> (fixture file, page wrapper)
+FIXTURE_MAP = {
+    "scrape_indeed": ("indeed_card.html", _html_page),
+    "scrape_linkedin": ("linkedin_card.html", _html_page),
+    "scrape_glassdoor": ("glassdoor_card.html", _html_page),
+    "scrape_jobdata_api": ("jobdata_item.json", _json_page("results")),
+    "scrape_remotive": ("remotive_item.json", _json_page("jobs")),
+    "scrape_jobicy": ("jobicy_item.json", _json_page("jobs")),
+    "scrape_iitjobs": ("rss_item.xml", _rss_page),
+    "scrape_craigslist": ("rss_item.xml", _rss_page),
+}
+
+
+HTML_PROVIDERS = {"scrape_indeed", "scrape_linkedin", "scrape_glassdoor"}
+
+
+def build_body(func_name, size):
+    """Render ``size`` cards for a provider; roughly one in ten links repeats."""
+    fixture, wrap = FIXTURE_MAP[func_name]
+    template = (FIXTURES / fixture).read_text()
+    cards = []
+    for i in range(size):
+        job_id = i - 1 if i % 10 == 9 else i
+        cards.append(
+            template.replace("@@N@@", str(job_id))
+            .replace("@@TITLE@@", TITLES[i % len(TITLES)])
+            .replace("@@COMPANY@@", COMPANIES[i % len(COMPANIES)])
+            .replace("@@LOCATION@@", LOCATIONS[i % len(LOCATIONS)])
+        )
+    return wrap(cards)
+
+
+class ReplayResponse:
+    """Stands in for both requests.Response and http_cache.CachedResponse."""
+
+    status_code = 200
+    encoding = "utf-8"
+    from_cache = True
+
+    def __init__(self, body: str):
+        self.text = body
+        self.content = body.encode()
+        self.headers = {}
+
+    def json(self):
+        return json.loads(self.content)
+
+    def open(self):
+        return io.BytesIO(self.content)
+
+    def iter_content(self, size=65536):
+        for i in range(0, len(self.content), size):
+            yield self.content[i:i + size]
+
+    def raise_for_status(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _measure(fn, memory):
+    gc.collect()
+    start = time.perf_counter()
+    out = fn()
+    seconds = time.perf_counter() - start
+    peak = None
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return out, seconds, peak
+
+
+def _filter_stage(rows):
+    return [
+        j for j in rows
+        if job_search.title_is_allowed(j["title"]) and "israel" in j["location"].lower()
+    ]
+
+
+def _dedup_stage(rows):
+    seen = set()
+    out = []
+    for j in rows:
+        c = job_search.canonical_url(j["link"])
+        if c not in seen:
+            seen.add(c)
+            out.append(j)
+    return out
+
+
+def available_parsers():
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        parsers.append("lxml")
+    except ImportError:
+        pass
+    return parsers
+
+
+def bench_provider(provider, size, memory=True, parser=None, fast=None):
+    func_name = provider.func_name
+    record = {"site": provider.site, "provider": func_name, "cards": size}
+    if func_name in HTML_PROVIDERS:
+        record["parser"] = parser or job_search.html_parse.PARSER
+        record["fast_path"] = job_search.html_parse.FAST_PATH if fast is None else fast
+    if func_name not in FIXTURE_MAP:
+        return [dict(record, stage="parse", skipped="no fixture")]
+    func = getattr(job_search, func_name)
+    resp = ReplayResponse(build_body(func_name, size))
+    replay = lambda url, **kwargs: resp  # noqa: E731
+    results = []
+    with mock.patch.object(job_search.http_client, "get", replay), \
+            mock.patch.object(job_search.http_cache, "get", replay), \
+            mock.patch.object(job_search.html_parse, "PARSER", record.get("parser", job_search.html_parse.PARSER)), \
+            mock.patch.object(job_search.html_parse, "FAST_PATH", record.get("fast_path", True)), \
+            mock.patch.object(job_search.feed_parse, "INCREMENTAL", False), \
+            mock.patch.object(job_search, "JOBDATA_INCREMENTAL", False), \
+            mock.patch.object(job_search.sync_state, "put", lambda key, value: None):
+        try:
+            rows, seconds, peak = _measure(lambda: list(func(KEYWORD)), memory)
+        except ImportError as exc:
+            return [dict(record, stage="parse", skipped=f"missing dependency: {exc.name}")]
+    results.append(dict(record, stage="parse", seconds=seconds, peak_bytes=peak, rows=len(rows)))
+    # Memoization would hide the matcher cost after the first size.
+    job_search.title_matcher._cached_matcher.cache_clear()
+    kept, seconds, peak = _measure(lambda: _filter_stage(rows), memory)
+    results.append(dict(record, stage="filter", seconds=seconds, peak_bytes=peak, rows=len(kept)))
+    unique, seconds, peak = _measure(lambda: _dedup_stage(kept), memory)
+    results.append(dict(record, stage="dedup", seconds=seconds, peak_bytes=peak, rows=len(unique)))
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes=DEFAULT_SIZES, providers=None, memory=True, compare_parsers=False):
+    selected = [
+        p for p in job_search.SCRAPERS
+        if not providers or p.site in providers or p.func_name in providers
+    ]
+    results = []
+    for size in sizes:
+        for provider in selected:
+            if compare_parsers and provider.func_name in HTML_PROVIDERS:
+                for parser in available_parsers():
+                    for fast in (False, True):
+                        results.extend(bench_provider(provider, size, memory, parser, fast))
+            else:
+                results.extend(bench_provider(provider, size, memory))
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--providers", default="", help="comma separated sites or scrape_* names")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--compare-parsers", action="store_true", help="benchmark every HTML backend")
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(
+        sizes=[int(s) for s in args.sizes.split(",") if s],
+        providers={p for p in args.providers.split(",") if p},
+        memory=not args.no_memory,
+        compare_parsers=args.compare_parsers,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
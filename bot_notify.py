@@ -1,39 +1,75 @@
 
-import os, time, json, requests
+import os, time, json
+
+import http_client
 
 TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
 API_URL = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}"
+WEBHOOK_MODE = os.getenv("TELEGRAM_WEBHOOK") == "1"
 
 def send_message(text):
     url = f"{API_URL}/sendMessage"
-    resp = requests.post(url, json={"chat_id": CHAT_ID, "text": text})
+    resp = http_client.post(url, json={"chat_id": CHAT_ID, "text": text}, provider="Telegram")
     resp.raise_for_status()
 
 def send_document(path, caption=None):
     """Upload a document to the chat."""
     url = f"{API_URL}/sendDocument"
     with open(path, "rb") as f:
-        resp = requests.post(
+        resp = http_client.post(
             url,
             data={"chat_id": CHAT_ID, "caption": caption or ""},
             files={"document": f},
+            provider="Telegram",
         )
     resp.raise_for_status()
 
-def await_reply(timeout_sec=1800):
-    """Polls for a reply that contains numbers like 1 3 4"""
-    url = f"{API_URL}/getUpdates"
-    start = time.time()
-    last_update_id = None
-    while time.time() - start < timeout_sec:
-        resp = requests.get(url, params={"timeout": 5, "offset": last_update_id or ""})
-        resp.raise_for_status()
-        data = resp.json()["result"]
-        if data:
-            last_update_id = data[-1]["update_id"] + 1
-            text = data[-1]["message"]["text"].strip()
-            if text and all(c.isdigit() or c.isspace() or c == ',' for c in text):
-                return text
-    return ""
+def send_digest(header, blocks):
+    """Send one block per job, split into as many messages as Telegram needs."""
+    import asyncio, telegram_client
+
+    client = telegram_client.AsyncTelegram(API_URL, CHAT_ID)
+    asyncio.run(client.send_digest(header, blocks))
+
+def send_documents(docs):
+    """Upload several (path, caption) documents at once."""
+    import asyncio, telegram_client
+
+    client = telegram_client.AsyncTelegram(API_URL, CHAT_ID)
+    asyncio.run(client.send_documents(docs))
+
+def _is_choice(text):
+    return bool(text) and all(c.isdigit() or c.isspace() or c == ',' for c in text)
+
+def await_reply(timeout_sec=1800, webhook=None):
+    """Waits for a reply that contains numbers like 1 3 4"""
+    import bot_updates
+
+    replies = []
+
+    def on_update(update):
+        text = bot_updates.message_text(update)
+        if _is_choice(text):
+            replies.append(text)
+
+    listener = bot_updates.UpdateListener(API_URL, [on_update])
+    deadline = time.time() + timeout_sec
+    webhook = WEBHOOK_MODE if webhook is None else webhook
+    if webhook and not bot_updates.WEBHOOK_URL:
+        print("WARN: TELEGRAM_WEBHOOK_URL is not set; falling back to long-polling")
+        webhook = False
+    if webhook:
+        server = listener.serve_webhook()
+        listener.set_webhook(bot_updates.WEBHOOK_URL)
+        try:
+            while not replies and time.time() < deadline:
+                time.sleep(1)
+        finally:
+            # getUpdates only works again once the webhook is removed.
+            listener.delete_webhook()
+            server.shutdown()
+    else:
+        listener.poll(deadline=deadline, stop=lambda: bool(replies))
+    return replies[0] if replies else ""
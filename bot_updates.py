@@ -0,0 +1,131 @@
+"""Telegram update listener: long-polling or a local webhook server.
+
+Every update in a batch is passed to each registered handler. The next
+``getUpdates`` offset is saved in ``sync_state`` once a batch has been
+dispatched, so a restart neither replays nor skips updates.
+"""
+
+import hmac
+import json
+import os
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import http_client
+import sync_state
+
+# Telegram holds a getUpdates request open for up to this many seconds.
+POLL_TIMEOUT = int(os.getenv("TELEGRAM_POLL_TIMEOUT", "50"))
+OFFSET_KEY = "telegram:offset"
+WEBHOOK_HOST = os.getenv("TELEGRAM_WEBHOOK_HOST", "127.0.0.1")
+WEBHOOK_PORT = int(os.getenv("TELEGRAM_WEBHOOK_PORT", "8443"))
+# Public HTTPS URL that forwards to the local server; required for webhook mode.
+WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL")
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+
+def message_text(update) -> str:
+    """The text of a message update, or "" for anything else (edits, joins, stickers)."""
+    message = update.get("message") or {}
+    return (message.get("text") or "").strip()
+
+
+class UpdateListener:
+    def __init__(self, api_url, handlers=(), poll_timeout=None):
+        self.api_url = api_url
+        self.handlers = list(handlers)
+        self.poll_timeout = POLL_TIMEOUT if poll_timeout is None else poll_timeout
+        self.offset = sync_state.get(OFFSET_KEY)
+        self.webhook_secret = os.getenv("TELEGRAM_WEBHOOK_SECRET") or secrets.token_urlsafe(32)
+        self._lock = threading.Lock()
+
+    def add_handler(self, handler):
+        self.handlers.append(handler)
+
+    def dispatch(self, updates):
+        """Run every handler on every update, then persist the next offset."""
+        with self._lock:
+            for update in updates:
+                for handler in self.handlers:
+                    handler(update)
+                update_id = update.get("update_id")
+                if update_id is not None and (self.offset is None or update_id >= self.offset):
+                    self.offset = update_id + 1
+            if updates:
+                sync_state.put(OFFSET_KEY, self.offset)
+
+    def poll_once(self, timeout=None):
+        timeout = self.poll_timeout if timeout is None else timeout
+        params = {"timeout": timeout}
+        if self.offset is not None:
+            params["offset"] = self.offset
+        resp = http_client.get(
+            f"{self.api_url}/getUpdates",
+            params=params,
+            provider="Telegram",
+            timeout=timeout + 10,
+        )
+        resp.raise_for_status()
+        updates = resp.json().get("result", [])
+        self.dispatch(updates)
+        return updates
+
+    def poll(self, deadline=None, stop=None):
+        """Long-poll until ``stop()`` is true or ``deadline`` (a time.time() value) passes."""
+        while not (stop and stop()):
+            remaining = None if deadline is None else deadline - time.time()
+            if remaining is not None and remaining <= 0:
+                return
+            timeout = self.poll_timeout if remaining is None else min(self.poll_timeout, int(remaining))
+            self.poll_once(timeout)
+
+    def serve_webhook(self, host=None, port=None, path="/"):
+        """Start a local HTTP server that dispatches POSTed updates; returns the server.
+
+        Requests without the listener's ``webhook_secret`` in the
+        ``X-Telegram-Bot-Api-Secret-Token`` header are rejected, so only
+        Telegram (told the secret by ``set_webhook``) can deliver updates.
+        A reverse proxy must forward the public webhook URL to this server.
+        Call ``shutdown()`` on the result to stop.
+        """
+        listener = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if self.path != path:
+                    self.send_error(404)
+                    return
+                token = self.headers.get(SECRET_HEADER) or ""
+                if not hmac.compare_digest(token.encode(), listener.webhook_secret.encode()):
+                    self.send_error(403)
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    update = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self.send_error(400)
+                    return
+                listener.dispatch([update])
+                self.send_response(200)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host or WEBHOOK_HOST, WEBHOOK_PORT if port is None else port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def set_webhook(self, url):
+        resp = http_client.post(
+            f"{self.api_url}/setWebhook",
+            json={"url": url, "secret_token": self.webhook_secret},
+            provider="Telegram",
+        )
+        resp.raise_for_status()
+
+    def delete_webhook(self):
+        resp = http_client.post(f"{self.api_url}/deleteWebhook", provider="Telegram")
+        resp.raise_for_status()
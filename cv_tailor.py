@@ -1,15 +1,150 @@
-
-from docx import Document
+import hashlib
+import io
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 BASE_CV_PATH = Path("templates/base_cv.docx")
+OUTPUT_DIR = Path(".")
+MAX_WORKERS = int(os.getenv("CV_WORKERS", "4"))
+
+# Placeholder name -> job field.
+FIELDS = {
+    "job_title": "title",
+    "company": "company",
+    "location": "location",
+}
+
+PLACEHOLDER = re.compile(r"\{\{(\w+)\}\}")
+
+
+def _iter_paragraphs(doc):
+    """Every paragraph in the body, tables (nested too), headers and footers."""
+
+    def walk(container):
+        yield from container.paragraphs
+        for table in getattr(container, "tables", []):
+            for row in table.rows:
+                for cell in row.cells:
+                    yield from walk(cell)
+
+    yield from walk(doc)
+    for section in doc.sections:
+        for part in (section.header, section.footer):
+            if not part.is_linked_to_previous:
+                yield from walk(part)
+
+
+def _gather_placeholders(paragraph):
+    """Move each placeholder split across runs into its first run; return runs holding one."""
+    runs = paragraph.runs
+    text = "".join(r.text for r in runs)
+    if "{{" not in text:
+        return []
+    starts, pos = [], 0
+    for r in runs:
+        starts.append(pos)
+        pos += len(r.text)
+    # Right to left, so text before the current match is still where starts says.
+    for m in reversed(list(PLACEHOLDER.finditer(text))):
+        span = [i for i, r in enumerate(runs) if starts[i] < m.end() and starts[i] + len(r.text) > m.start()]
+        first, last = span[0], span[-1]
+        if first == last:
+            continue
+        runs[first].text = runs[first].text[: m.start() - starts[first]] + m.group(0)
+        for i in span[1:-1]:
+            runs[i].text = ""
+        runs[last].text = runs[last].text[m.end() - starts[last]:]
+    return [r for r in runs if PLACEHOLDER.search(r.text)]
+
+
+class Template:
+    """The base CV parsed once, with the runs that carry ``{{...}}`` placeholders."""
+
+    def __init__(self, data: bytes):
+        from docx import Document
+
+        self.doc = Document(io.BytesIO(data))
+        self.slots = [
+            (run, run.text)
+            for p in _iter_paragraphs(self.doc)
+            for run in _gather_placeholders(p)
+        ]
+
+    def render(self, job, out_path: Path) -> Path:
+        """Fill the placeholders for ``job``, save to ``out_path`` and restore the template."""
+        values = {name: job.get(field) or "" for name, field in FIELDS.items()}
+        sub = lambda m: values.get(m.group(1), m.group(0))  # noqa: E731
+        try:
+            for run, original in self.slots:
+                run.text = PLACEHOLDER.sub(sub, original)
+            self.doc.save(str(out_path))
+        finally:
+            for run, original in self.slots:
+                run.text = original
+        return out_path
+
+
+_worker_template = None
+# (path, mtime, size) -> (bytes, parsed Template) for the in-process path, so
+# a long-running process parses the base CV once until the file changes.
+_cached = {}
+# Rendering edits the shared template in place.
+_render_lock = threading.Lock()
+
+
+def _init_worker(data: bytes):
+    global _worker_template
+    _worker_template = Template(data)
+
+
+def _render(job, out_path):
+    return _worker_template.render(job, out_path)
+
+
+def output_path(job, out_dir=None) -> Path:
+    """``cv_<company>_<link hash>.docx``; two roles at one company get distinct files."""
+    company = re.sub(r"\W+", "_", (job.get("company") or "company").lower()).strip("_")
+    key = hashlib.sha1((job.get("link") or job.get("title") or "").encode()).hexdigest()[:8]
+    return Path(out_dir or OUTPUT_DIR) / f"cv_{company or 'company'}_{key}.docx"
+
+
+def _load_template(path=None):
+    """The base CV's bytes and parsed Template, reparsed only when the file changes."""
+    path = Path(path or BASE_CV_PATH)
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    hit = _cached.get(key)
+    if hit is None:
+        data = path.read_bytes()
+        _cached.clear()
+        hit = _cached[key] = (data, Template(data))
+    return hit
+
+
+def base_cv_text(path=None) -> str:
+    """The base CV's text without placeholders, for relevance scoring."""
+    _, template = _load_template(path)
+    return "\n".join(PLACEHOLDER.sub(" ", p.text) for p in _iter_paragraphs(template.doc))
+
+
+def tailor_cvs(jobs, out_dir=None, max_workers=None):
+    """Tailor the base CV for every job, parsing the template once per worker."""
+    jobs = [dict(job) for job in jobs]
+    if not jobs:
+        return []
+    data, template = _load_template()
+    paths = [output_path(job, out_dir) for job in jobs]
+    workers = max(1, min(max_workers or MAX_WORKERS, len(jobs)))
+    if workers == 1:
+        with _render_lock:
+            return [template.render(job, path) for job, path in zip(jobs, paths)]
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(data,)) as pool:
+        return list(pool.map(_render, jobs, paths))
+
 
 def tailor_cv(job):
     """Replaces placeholder tags in the base CV and saves a tailored copy."""
-    doc = Document(str(BASE_CV_PATH))
-    for p in doc.paragraphs:
-        p.text = p.text.replace("{{job_title}}", job["title"])
-        p.text = p.text.replace("{{company}}", job["company"])
-    out_path = Path(f"cv_{job['company'].lower().replace(' ', '_')}.docx")
-    doc.save(out_path)
-    return out_path
+    return tailor_cvs([job])[0]
@@ -0,0 +1,68 @@
+"""Resident runner: ``main.run`` on a fixed interval in one long-lived process.
+
+Between cycles the process keeps what a cold start rebuilds: the pooled HTTP
+sessions, the parsed CV template, the title matcher memo and each profile's
+open history database. A cycle starts ``INTERVAL_MIN`` minutes after the
+previous one started, or straight away if that one overran (a cycle includes
+waiting for the Telegram reply). SIGINT or SIGTERM stops the loop between
+cycles.
+"""
+
+import argparse
+import os
+import signal
+import threading
+import time
+import traceback
+
+import http_client
+import main
+import sync_state
+from profiles import PROFILES, by_name
+
+INTERVAL_MIN = float(os.getenv("DAEMON_INTERVAL_MIN", "60"))
+
+
+def serve(profiles=None, interval_min=None, stop=None, cycles=None):
+    """Run cycles until ``stop`` (a threading.Event) is set or ``cycles`` have run."""
+    profiles = profiles or PROFILES
+    interval = 60 * (INTERVAL_MIN if interval_min is None else interval_min)
+    stop = stop or threading.Event()
+    histories = {p.name: main.load_history(p) for p in profiles}
+    done = 0
+    try:
+        while not stop.is_set():
+            started = time.monotonic()
+            try:
+                main.run(profiles, histories=histories)
+            except Exception:
+                print("WARN: cycle failed")
+                traceback.print_exc()
+                # Marks staged by the failed cycle cover postings it never saved.
+                sync_state.discard()
+            done += 1
+            if cycles is not None and done >= cycles:
+                break
+            stop.wait(max(0.0, started + interval - time.monotonic()))
+    finally:
+        for hist in histories.values():
+            hist.close()
+        http_client.close_all()
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Run the job search on a schedule")
+    parser.add_argument("--interval", type=float, default=INTERVAL_MIN, help="minutes between cycle starts")
+    parser.add_argument("--profile", action="append", help="profile name (repeatable); default: all")
+    parser.add_argument("--once", action="store_true", help="run a single cycle and exit")
+    args = parser.parse_args(argv)
+
+    stop = threading.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: stop.set())
+    profiles = by_name(*args.profile) if args.profile else None
+    serve(profiles, args.interval, stop, cycles=1 if args.once else None)
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,171 @@
+"""Near-duplicate index for the same posting listed by several providers.
+
+Each job is reduced to a normalized (company, title, location). Candidates
+are found with MinHash locality-sensitive hashing over the title tokens,
+banded per company, so a lookup touches only postings that share a band
+instead of scanning everything. A candidate counts as the same posting when
+the companies match, the title token sets have a Jaccard similarity of at
+least ``TITLE_SIMILARITY`` and the locations overlap (or one is blank).
+
+Postings added during a run stay in memory until ``save``, which writes
+them next to the history tables so reposts on later days are caught too.
+Jobs without a company are never matched: titles alone are too generic.
+"""
+
+import hashlib
+import re
+import sqlite3
+from datetime import datetime, timedelta
+
+TITLE_SIMILARITY = 0.75
+BANDS = 8
+ROWS = 2
+MAX_AGE_DAYS = 60
+
+_STOP = {"ltd", "inc", "llc", "limited", "corp", "co", "gmbh", "the", "israel", "il", "yafo", "jaffa"}
+_ALIASES = {"sr": "senior", "snr": "senior", "jr": "junior", "mgr": "manager", "pm": "product manager"}
+
+
+def tokens(text: str):
+    """Lower-case word tokens with common abbreviations expanded and filler dropped."""
+    words = re.sub(r"[^0-9a-z]+", " ", (text or "").lower()).split()
+    return [t for w in words for t in _ALIASES.get(w, w).split() if t not in _STOP]
+
+
+def normalize(job):
+    """Return (company, title tokens, location tokens) for a job."""
+    location = (job.get("location") or "").split(",")[0]
+    return (
+        " ".join(tokens(job.get("company"))),
+        frozenset(tokens(job.get("title"))),
+        frozenset(tokens(location)),
+    )
+
+
+def _minhash(tokens):
+    """BANDS * ROWS minimum hash values, one 32-bit slice of a blake2b digest each."""
+    n = BANDS * ROWS
+    mins = [0xFFFFFFFF] * n
+    for token in tokens:
+        digest = hashlib.blake2b(token.encode(), digest_size=4 * n).digest()
+        for i in range(n):
+            value = int.from_bytes(digest[4 * i:4 * i + 4], "big")
+            if value < mins[i]:
+                mins[i] = value
+    return mins
+
+
+def band_keys(company, title_tokens):
+    """One signed 63-bit key per LSH band, scoped to the company."""
+    mins = _minhash(title_tokens)
+    keys = []
+    for b in range(BANDS):
+        part = ",".join(map(str, mins[b * ROWS:(b + 1) * ROWS]))
+        digest = hashlib.blake2b(f"{company}|{b}|{part}".encode(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def _similar(a, b) -> bool:
+    company_a, title_a, loc_a = a
+    company_b, title_b, loc_b = b
+    if company_a != company_b:
+        return False
+    union = title_a | title_b
+    if not union or len(title_a & title_b) / len(union) < TITLE_SIMILARITY:
+        return False
+    return not loc_a or not loc_b or bool(loc_a & loc_b)
+
+
+class DedupIndex:
+    def __init__(self, conn: sqlite3.Connection = None):
+        self._conn = conn
+        self._bands = {}
+        self._pending = []
+        if conn is not None:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS dedup_postings ("
+                " id INTEGER PRIMARY KEY,"
+                " link TEXT NOT NULL,"
+                " company TEXT NOT NULL,"
+                " title TEXT NOT NULL,"
+                " location TEXT NOT NULL,"
+                " added TEXT NOT NULL"
+                ")"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS dedup_bands ("
+                " band INTEGER NOT NULL,"
+                " posting INTEGER NOT NULL"
+                ")"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS dedup_bands_band ON dedup_bands (band)")
+            conn.commit()
+
+    def _stored(self, keys):
+        if self._conn is None:
+            return
+        marks = ",".join("?" * len(keys))
+        rows = self._conn.execute(
+            "SELECT DISTINCT p.link, p.company, p.title, p.location FROM dedup_bands b"
+            f" JOIN dedup_postings p ON p.id = b.posting WHERE b.band IN ({marks})",
+            keys,
+        )
+        for link, company, title, location in rows:
+            yield link, (company, frozenset(title.split()), frozenset(location.split()))
+
+    def match(self, job):
+        """Return ``(link, from_this_run)`` for a near-duplicate of ``job``, else None."""
+        norm = normalize(job)
+        if not norm[0] or not norm[1]:
+            return None
+        keys = band_keys(norm[0], norm[1])
+        for key in keys:
+            for link, other in self._bands.get(key, ()):
+                if _similar(norm, other):
+                    return link, True
+        for link, other in self._stored(keys):
+            if _similar(norm, other):
+                return link, False
+        return None
+
+    def add(self, job, link=None):
+        """Index ``job`` for the rest of the run; ``save`` persists it."""
+        norm = normalize(job)
+        if not norm[0] or not norm[1]:
+            return
+        link = link or job["link"]
+        keys = band_keys(norm[0], norm[1])
+        for key in keys:
+            self._bands.setdefault(key, []).append((link, norm))
+        self._pending.append((link, norm, keys))
+
+    def save(self, links=None):
+        """Persist this run's postings and drop ones older than MAX_AGE_DAYS.
+
+        With ``links``, only the postings indexed under one of them are kept;
+        the rest may come back as new in a later run.
+        """
+        if self._conn is None:
+            return
+        now = datetime.now()
+        with self._conn:
+            for link, (company, title, location), keys in self._pending:
+                if links is not None and link not in links:
+                    continue
+                cur = self._conn.execute(
+                    "INSERT INTO dedup_postings (link, company, title, location, added) VALUES (?, ?, ?, ?, ?)",
+                    (link, company, " ".join(sorted(title)), " ".join(sorted(location)),
+                     now.isoformat(timespec="seconds")),
+                )
+                self._conn.executemany(
+                    "INSERT INTO dedup_bands (band, posting) VALUES (?, ?)",
+                    ((key, cur.lastrowid) for key in keys),
+                )
+            cutoff = (now - timedelta(days=MAX_AGE_DAYS)).isoformat(timespec="seconds")
+            self._conn.execute(
+                "DELETE FROM dedup_bands WHERE posting IN (SELECT id FROM dedup_postings WHERE added < ?)",
+                (cutoff,),
+            )
+            self._conn.execute("DELETE FROM dedup_postings WHERE added < ?", (cutoff,))
+        self._pending.clear()
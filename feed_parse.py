@@ -0,0 +1,58 @@
+"""Incremental RSS reader shared by the feed scrapers.
+
+``iter_items`` walks the feed with ``ElementTree.iterparse`` straight from the
+response body, yields one ``<item>`` at a time and drops it from the tree once
+it has been read, so memory stays flat however long the feed is. Given a
+``since`` datetime it stops at the first item published before it (feeds list
+newest first). ``FEED_INCREMENTAL=0`` turns that cut-off off.
+"""
+
+import os
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from xml.etree import ElementTree
+
+INCREMENTAL = os.getenv("FEED_INCREMENTAL", "1") == "1"
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def parse_date(value):
+    """Parse an RFC 822 ``pubDate`` or an ISO timestamp; ``None`` if neither."""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            parsed = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def iter_items(source, since=None):
+    """Yield each ``<item>`` as a dict of its child element texts.
+
+    ``source`` is a binary file object. Iteration ends at the first item whose
+    ``pubDate`` is older than ``since``.
+    """
+    stack = []
+    for event, elem in ElementTree.iterparse(source, events=("start", "end")):
+        if event == "start":
+            stack.append(elem)
+            continue
+        stack.pop()
+        if _local(elem.tag) != "item":
+            continue
+        item = {_local(child.tag): (child.text or "").strip() for child in elem}
+        if stack:
+            stack[-1].remove(elem)
+        elem.clear()
+        if since is not None:
+            published = parse_date(item.get("pubDate"))
+            if published is not None and published < since:
+                return
+        yield item
@@ -0,0 +1,93 @@
+"""SQLite-backed record of seen and applied job links."""
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from dedup_index import DedupIndex
+from task_queue import TaskQueue
+
+SEEN = "seen"
+APPLIED = "applied"
+
+_LEGACY_KEYS = {"seen_links": SEEN, "applied_links": APPLIED}
+
+
+class HistoryStore:
+    """Indexed history with incremental, transactional appends.
+
+    ``legacy_json`` points at an old ``history.json``-style file; its links are
+    imported on first open and the file is renamed to ``*.migrated``.
+    """
+
+    def __init__(self, path, legacy_json=None):
+        self.path = Path(path)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS links ("
+            " kind TEXT NOT NULL,"
+            " link TEXT NOT NULL,"
+            " added TEXT NOT NULL,"
+            " PRIMARY KEY (kind, link)"
+            ") WITHOUT ROWID"
+        )
+        self._conn.commit()
+        if legacy_json is not None:
+            self._migrate(Path(legacy_json))
+
+    def _migrate(self, json_path: Path):
+        if not json_path.exists():
+            return
+        data = json.loads(json_path.read_text() or "{}")
+        for key, kind in _LEGACY_KEYS.items():
+            self._add(kind, data.get(key, []))
+        json_path.rename(json_path.with_name(json_path.name + ".migrated"))
+
+    def _add(self, kind, links):
+        now = datetime.now().isoformat(timespec="seconds")
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO links (kind, link, added) VALUES (?, ?, ?)",
+                ((kind, link, now) for link in links),
+            )
+
+    def _has(self, kind, link) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM links WHERE kind = ? AND link = ?", (kind, link)
+        ).fetchone()
+        return row is not None
+
+    def is_seen(self, link: str) -> bool:
+        return self._has(SEEN, link)
+
+    def is_applied(self, link: str) -> bool:
+        return self._has(APPLIED, link)
+
+    def mark_seen(self, links):
+        self._add(SEEN, links)
+
+    def mark_applied(self, link: str):
+        self._add(APPLIED, [link])
+
+    def dedup_index(self):
+        """A near-duplicate index stored in the same database."""
+        return DedupIndex(self._conn)
+
+    def task_queue(self):
+        """A durable application-step queue stored in the same database."""
+        return TaskQueue(self._conn)
+
+    def links(self, kind=SEEN):
+        return [row[0] for row in self._conn.execute("SELECT link FROM links WHERE kind = ?", (kind,))]
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,34 @@
+"""HTML parsing backend shared by the scrapers.
+
+``HTML_PARSER`` picks the BeautifulSoup tree builder; it defaults to lxml when
+installed and falls back to the pure-Python ``html.parser``. With
+``HTML_FAST_PATH`` on (the default) only the job-card subtrees are built.
+"""
+
+import os
+
+
+def _default_parser() -> str:
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return "html.parser"
+    return "lxml"
+
+
+PARSER = os.getenv("HTML_PARSER") or _default_parser()
+FAST_PATH = os.getenv("HTML_FAST_PATH", "1") == "1"
+FALLBACK_PARSER = "html.parser"
+
+
+def parse_cards(markup, tag: str, css_class: str, parser=None, fast=None):
+    """Parse ``markup``; on the fast path keep only ``<tag class=css_class>`` subtrees."""
+    import bs4
+
+    parser = parser or PARSER
+    fast = FAST_PATH if fast is None else fast
+    kwargs = {"parse_only": bs4.SoupStrainer(tag, class_=css_class)} if fast else {}
+    try:
+        return bs4.BeautifulSoup(markup, parser, **kwargs)
+    except bs4.FeatureNotFound:
+        return bs4.BeautifulSoup(markup, FALLBACK_PARSER, **kwargs)
@@ -0,0 +1,146 @@
+"""On-disk HTTP response cache with ETag / Last-Modified revalidation.
+
+Bodies are streamed to ``CACHE_DIR`` next to a small JSON file holding the
+validators. Set ``HTTP_CACHE_REPLAY=1`` to serve everything from the cache
+without touching the network (handy for offline development).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import http_client
+import metrics
+
+CACHE_DIR = Path(os.getenv("HTTP_CACHE_DIR", ".http_cache"))
+DEFAULT_TTL = 0
+# Seconds a cached body is served without revalidating.
+TTLS = {
+    "JobdataAPI": 1800,
+    "Remotive": 3600,
+    "Jobicy": 3600,
+    "IITJobs": 1800,
+    "Craigslist": 1800,
+}
+CHUNK_SIZE = 64 * 1024
+
+
+class CacheMiss(LookupError):
+    """Raised in replay mode when a URL has never been cached."""
+
+
+def replay_enabled() -> bool:
+    return os.getenv("HTTP_CACHE_REPLAY") == "1"
+
+
+class CachedResponse:
+    """Minimal response object backed by a cached body file."""
+
+    status_code = 200
+
+    def __init__(self, url, body_path, meta, from_cache):
+        self.url = url
+        self.headers = meta.get("headers", {})
+        self.encoding = meta.get("encoding")
+        self.from_cache = from_cache
+        self._body_path = body_path
+
+    def open(self):
+        return open(self._body_path, "rb")
+
+    @property
+    def content(self) -> bytes:
+        return self._body_path.read_bytes()
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        pass
+
+
+def _paths(url):
+    key = hashlib.sha256(url.encode()).hexdigest()
+    return CACHE_DIR / f"{key}.body", CACHE_DIR / f"{key}.json"
+
+
+def _load_meta(body_path, meta_path):
+    if not (body_path.exists() and meta_path.exists()):
+        return None
+    try:
+        return json.loads(meta_path.read_text())
+    except ValueError:
+        return None
+
+
+def _write_atomic(path, data: bytes):
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _store(url, resp, body_path, meta_path, label):
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix=".tmp")
+    size = 0
+    with os.fdopen(fd, "wb") as f:
+        for chunk in resp.iter_content(CHUNK_SIZE):
+            f.write(chunk)
+            size += len(chunk)
+    metrics.count("http_bytes_total", size, provider=label)
+    os.replace(tmp, body_path)
+    meta = {
+        "url": url,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "encoding": resp.encoding,
+        "headers": {"Content-Type": resp.headers.get("Content-Type", "")},
+        "fetched_at": time.time(),
+    }
+    _write_atomic(meta_path, json.dumps(meta).encode())
+    return meta
+
+
+def get(url, *, provider=None, ttl=None, headers=None, **kwargs):
+    """GET ``url`` through the cache, revalidating with conditional headers."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    body_path, meta_path = _paths(url)
+    meta = _load_meta(body_path, meta_path)
+
+    if replay_enabled():
+        if meta is None:
+            raise CacheMiss(url)
+        return CachedResponse(url, body_path, meta, from_cache=True)
+
+    label = provider or urlsplit(url).netloc
+    ttl = TTLS.get(provider, DEFAULT_TTL) if ttl is None else ttl
+    if meta and time.time() - meta["fetched_at"] < ttl:
+        metrics.count("http_cache_total", provider=label, result="fresh")
+        return CachedResponse(url, body_path, meta, from_cache=True)
+
+    request_headers = dict(headers or {})
+    if meta and meta.get("etag"):
+        request_headers["If-None-Match"] = meta["etag"]
+    if meta and meta.get("last_modified"):
+        request_headers["If-Modified-Since"] = meta["last_modified"]
+
+    resp = http_client.get(url, headers=request_headers, provider=provider, stream=True, **kwargs)
+    try:
+        if resp.status_code == 304 and meta:
+            metrics.count("http_cache_total", provider=label, result="revalidated")
+            meta["fetched_at"] = time.time()
+            _write_atomic(meta_path, json.dumps(meta).encode())
+            return CachedResponse(url, body_path, meta, from_cache=True)
+        resp.raise_for_status()
+        meta = _store(url, resp, body_path, meta_path, label)
+    finally:
+        resp.close()
+    return CachedResponse(url, body_path, meta, from_cache=False)
@@ -0,0 +1,155 @@
+"""Shared HTTP transport: pooled per-host sessions with retry and backoff."""
+
+import os
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import metrics
+
+# Imported on first use (see _requests) so CLIs start without paying for it.
+requests = None
+
+POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "8"))
+MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+BACKOFF_BASE = float(os.getenv("HTTP_BACKOFF_BASE", "0.5"))
+BACKOFF_MAX = 30.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Only these methods are resent after an error or a 5xx: the server may have
+# acted on a request that timed out, and a second POST would act again.
+IDEMPOTENT = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+# A 429 means the request was refused unprocessed, so even a POST may be resent.
+UNPROCESSED_STATUSES = {429}
+# Retries after a timeout; a blocked site tends to time out every time.
+TIMEOUT_RETRIES = int(os.getenv("HTTP_TIMEOUT_RETRIES", "0"))
+
+DEFAULT_TIMEOUT = 20
+# Per-provider request timeouts in seconds.
+TIMEOUTS = {
+    "Indeed": 20,
+    "LinkedIn": 20,
+    "Glassdoor": 20,
+    "JobdataAPI": 30,
+    "Remotive": 20,
+    "Jobicy": 20,
+    "IITJobs": 15,
+    "Craigslist": 15,
+    "Telegram": 30,
+}
+
+_sessions = {}
+_lock = threading.Lock()
+
+
+def _requests():
+    global requests
+    if requests is None:
+        import requests as module
+
+        requests = module
+    return requests
+
+
+def _accept_encoding() -> str:
+    """Advertise brotli only when urllib3 can actually decode it."""
+    for mod in ("brotli", "brotlicffi"):
+        try:
+            __import__(mod)
+            return "gzip, deflate, br"
+        except ImportError:
+            continue
+    return "gzip, deflate"
+
+
+def session_for(url: str):
+    """Return the keep-alive session for the URL's host, creating it on first use."""
+    host = urlsplit(url).netloc
+    with _lock:
+        session = _sessions.get(host)
+        if session is None:
+            from requests.adapters import HTTPAdapter
+
+            session = _requests().Session()
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers["Accept-Encoding"] = _accept_encoding()
+            _sessions[host] = session
+    return session
+
+
+def backoff_delay(attempt: int, retry_after=None) -> float:
+    """Exponential backoff with full jitter, honouring a numeric Retry-After."""
+    if retry_after and str(retry_after).isdigit():
+        return min(BACKOFF_MAX, float(retry_after))
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _rewind(files):
+    """Seek uploaded file objects back to the start before a retry."""
+    for value in (files or {}).values():
+        fobj = value[1] if isinstance(value, tuple) else value
+        if hasattr(fobj, "seek"):
+            fobj.seek(0)
+
+
+def request(method, url, *, provider=None, timeout=None, retries=None, **kwargs):
+    """Send a request through the pooled session, retrying transient failures.
+
+    Connection errors and 5xx responses are retried for idempotent methods
+    only, and timeouts at most TIMEOUT_RETRIES times. Other methods are
+    resent only after a 429.
+    """
+    timeout = timeout or TIMEOUTS.get(provider, DEFAULT_TIMEOUT)
+    retries = MAX_RETRIES if retries is None else retries
+    session = session_for(url)
+    label = provider or urlsplit(url).netloc
+    req = _requests()
+    idempotent = method.upper() in IDEMPOTENT
+    statuses = RETRY_STATUSES if idempotent else UNPROCESSED_STATUSES
+    timeouts = 0
+    for attempt in range(retries + 1):
+        if attempt:
+            _rewind(kwargs.get("files"))
+        try:
+            with metrics.timer("http_request", provider=label):
+                resp = session.request(method, url, timeout=timeout, **kwargs)
+        except (req.ConnectionError, req.Timeout) as exc:
+            metrics.count("http_errors_total", provider=label)
+            # ConnectTimeout is both; it counts as a timeout.
+            if isinstance(exc, req.Timeout):
+                timeouts += 1
+            if not idempotent or attempt == retries or timeouts > TIMEOUT_RETRIES:
+                raise
+            time.sleep(backoff_delay(attempt))
+            continue
+        metrics.count("http_requests_total", provider=label, status=resp.status_code)
+        if resp.status_code not in statuses or attempt == retries:
+            length = resp.headers.get("Content-Length")
+            if length and length.isdigit() and not kwargs.get("stream"):
+                # Streamed bodies are counted where they are read (http_cache).
+                metrics.count("http_bytes_total", int(length), provider=label)
+            return resp
+        retry_after = resp.headers.get("Retry-After")
+        resp.close()
+        time.sleep(backoff_delay(attempt, retry_after))
+
+
+def get(url, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def post(url, **kwargs):
+    """POST without retries unless ``retries`` is given; even then only a 429 is resent."""
+    kwargs.setdefault("retries", 0)
+    return request("POST", url, **kwargs)
+
+
+def close_all():
+    """Close every pooled session."""
+    with _lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
@@ -0,0 +1,194 @@
+"""Archive of every scraped job with a full-text index.
+
+Each posting is stored once per canonical link, with the site that listed it,
+its posting date (the day it was first scraped when the provider gives none)
+and when it was first and last seen. An FTS5 index covers title, company and
+location; plain indexes on the date and site keep range and per-site queries
+off the full table. Rows are buffered and written ``BATCH_SIZE`` at a time.
+
+Query from the command line::
+
+    python job_archive.py "staff product manager" --location haifa --since 2024-07-01 --companies
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+from datetime import date
+from pathlib import Path
+
+import metrics
+from job_record import Job
+
+ARCHIVE_DB = Path(os.getenv("JOB_ARCHIVE_DB", "jobs_archive.db"))
+BATCH_SIZE = 500
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS jobs ("
+    " id INTEGER PRIMARY KEY,"
+    " link TEXT NOT NULL UNIQUE,"
+    " title TEXT NOT NULL,"
+    " company TEXT NOT NULL,"
+    " location TEXT NOT NULL,"
+    " site TEXT NOT NULL,"
+    " posted TEXT NOT NULL,"
+    " first_seen TEXT NOT NULL,"
+    " last_seen TEXT NOT NULL"
+    ")",
+    "CREATE INDEX IF NOT EXISTS jobs_posted ON jobs (posted)",
+    "CREATE INDEX IF NOT EXISTS jobs_site ON jobs (site, posted)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5("
+    " title, company, location, content='jobs', content_rowid='id', tokenize='unicode61')",
+    # Keep the external-content index in step with the table.
+    "CREATE TRIGGER IF NOT EXISTS jobs_ai AFTER INSERT ON jobs BEGIN"
+    " INSERT INTO jobs_fts (rowid, title, company, location)"
+    " VALUES (new.id, new.title, new.company, new.location); END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_ad AFTER DELETE ON jobs BEGIN"
+    " INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location)"
+    " VALUES ('delete', old.id, old.title, old.company, old.location); END",
+    "CREATE TRIGGER IF NOT EXISTS jobs_au AFTER UPDATE OF title, company, location ON jobs BEGIN"
+    " INSERT INTO jobs_fts (jobs_fts, rowid, title, company, location)"
+    " VALUES ('delete', old.id, old.title, old.company, old.location);"
+    " INSERT INTO jobs_fts (rowid, title, company, location)"
+    " VALUES (new.id, new.title, new.company, new.location); END",
+)
+
+# A repost keeps its row; only the sighting moves.
+_UPSERT = (
+    "INSERT INTO jobs (link, title, company, location, site, posted, first_seen, last_seen)"
+    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    " ON CONFLICT (link) DO UPDATE SET last_seen = excluded.last_seen"
+)
+
+
+def _phrase(text: str) -> str:
+    """Quote user text as an FTS5 phrase so operators in it are taken literally."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def fts_query(text=None, company=None, location=None) -> str:
+    """Build a MATCH expression: every word of ``text`` anywhere, plus column phrases."""
+    terms = [_phrase(word) for word in (text or "").split()]
+    if company:
+        terms.append(f"company : {_phrase(company)}")
+    if location:
+        terms.append(f"location : {_phrase(location)}")
+    return " AND ".join(terms)
+
+
+class JobArchive:
+    def __init__(self, path=None):
+        self.path = Path(path or ARCHIVE_DB)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            for statement in _SCHEMA:
+                self._conn.execute(statement)
+        self._rows = []
+        self._today = date.today().isoformat()
+
+    def add(self, job, site: str):
+        """Buffer one scraped job; written by the next full batch or ``flush``."""
+        if not isinstance(job, Job):
+            job = Job.from_dict(job)
+        if not job.canonical:
+            return
+        posted = job.posted.isoformat() if job.posted else self._today
+        self._rows.append(
+            (job.canonical, job.title, job.company, job.location, site, posted, self._today, self._today)
+        )
+        if len(self._rows) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+        with self._conn:
+            self._conn.executemany(_UPSERT, self._rows)
+        metrics.count("archive_rows_total", len(self._rows))
+        self._rows.clear()
+
+    def _where(self, text, company, location, site, since, until):
+        clauses, params = [], []
+        match = fts_query(text, company, location)
+        if match:
+            clauses.append("jobs.id IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)")
+            params.append(match)
+        if site:
+            clauses.append("jobs.site = ?")
+            params.append(site)
+        if since:
+            clauses.append("jobs.posted >= ?")
+            params.append(str(since))
+        if until:
+            clauses.append("jobs.posted <= ?")
+            params.append(str(until))
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def search(self, text=None, company=None, location=None, site=None, since=None, until=None, limit=50):
+        """Newest matching postings as dicts.
+
+        ``text`` words must all occur in the title, company or location;
+        ``company`` and ``location`` are phrases matched in that column only.
+        ``since`` and ``until`` are inclusive ISO dates.
+        """
+        where, params = self._where(text, company, location, site, since, until)
+        rows = self._conn.execute(
+            "SELECT link, title, company, location, site, posted, first_seen, last_seen FROM jobs"
+            f"{where} ORDER BY posted DESC, id DESC LIMIT ?",
+            (*params, limit),
+        )
+        return [dict(row) for row in rows]
+
+    def companies(self, text=None, company=None, location=None, site=None, since=None, until=None, limit=50):
+        """``(company, postings)`` pairs for the matching postings, most postings first."""
+        where, params = self._where(text, company, location, site, since, until)
+        rows = self._conn.execute(
+            f"SELECT company, COUNT(*) AS postings FROM jobs{where}"
+            " GROUP BY company ORDER BY postings DESC, company LIMIT ?",
+            (*params, limit),
+        )
+        return [(row["company"], row["postings"]) for row in rows]
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query the scraped job archive")
+    parser.add_argument("text", nargs="?", help="words that must all appear in title, company or location")
+    parser.add_argument("--company")
+    parser.add_argument("--location")
+    parser.add_argument("--site")
+    parser.add_argument("--since", help="first posting date, YYYY-MM-DD")
+    parser.add_argument("--until", help="last posting date, YYYY-MM-DD")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--companies", action="store_true", help="count postings per company instead")
+    parser.add_argument("--db", default=str(ARCHIVE_DB))
+    args = parser.parse_args(argv)
+
+    query = dict(text=args.text, company=args.company, location=args.location,
+                 site=args.site, since=args.since, until=args.until, limit=args.limit)
+    with JobArchive(args.db) as archive:
+        if args.companies:
+            for company, postings in archive.companies(**query):
+                print(f"{postings}\t{company}")
+        else:
+            for row in archive.search(**query):
+                print(json.dumps(row, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Compact job record shared by every pipeline stage.
+
+``Job`` keeps the five posting fields in slots, interns the company and
+location (the same few values repeat across thousands of postings), and
+computes the canonical link, its hash and the parsed posting date once when
+the record is built. It reads like the plain dicts the scrapers used to yield
+(``job["title"]``, ``job.get("company")``, ``dict(job)``), so code and tests
+written against dicts keep working; the pipeline accepts either.
+"""
+
+import sys
+from collections.abc import Mapping
+from functools import lru_cache
+
+import feed_parse
+
+FIELDS = ("title", "company", "location", "link", "date")
+
+
+def canonical_url(url: str) -> str:
+    """Return a canonical form of the URL for deduping."""
+    return url.split("?", 1)[0]
+
+
+def canonical(job) -> str:
+    """The canonical link of a Job or a plain job dict."""
+    if isinstance(job, Job):
+        return job.canonical
+    return canonical_url(job["link"])
+
+
+@lru_cache(maxsize=1024)
+def _parse_date(value):
+    parsed = feed_parse.parse_date(value)
+    return parsed.date() if parsed else None
+
+
+class Job(Mapping):
+    __slots__ = ("title", "company", "location", "link", "date", "posted", "canonical", "_hash", "alt_links")
+
+    def __init__(self, title, company, location, link, date=""):
+        self.title = title or ""
+        self.company = sys.intern(company or "")
+        self.location = sys.intern(location or "")
+        self.link = link
+        self.date = date or ""
+        self.posted = _parse_date(self.date)
+        self.canonical = canonical_url(link or "")
+        self._hash = hash(self.canonical)
+        # Links to the same posting on other providers, set by collapse_duplicates.
+        self.alt_links = None
+
+    @classmethod
+    def from_dict(cls, data):
+        job = cls(*(data.get(field) for field in FIELDS))
+        if data.get("alt_links") is not None:
+            job.alt_links = list(data["alt_links"])
+        return job
+
+    def _keys(self):
+        return FIELDS if self.alt_links is None else FIELDS + ("alt_links",)
+
+    def __getitem__(self, key):
+        if key not in self._keys():
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def __hash__(self):
+        return self._hash
+
+    def __setitem__(self, key, value):
+        if key != "alt_links":
+            raise TypeError(f"Job.{key} is read-only")
+        self.alt_links = value
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def copy(self):
+        return Job.from_dict(self)
+
+    def __reduce__(self):
+        return Job.from_dict, (dict(self),)
+
+    def __repr__(self):
+        return f"Job({dict(self)!r})"
@@ -1,15 +1,25 @@
 # Local job search for product manager roles in Israel
 
 import html
+import os
+import queue
 import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from typing import NamedTuple
 from urllib.parse import quote_plus
 
-import requests
-from bs4 import BeautifulSoup
-import difflib
+import feed_parse
+import http_cache
+import http_client
+import html_parse
+import metrics
+import sync_state
+import title_matcher
 from bot_notify import send_message
+from job_record import Job, canonical, canonical_url
 
 HEADERS = {
     "User-Agent": (
@@ -21,11 +31,6 @@ HEADERS = {
 }
 
 
-def canonical_url(url: str) -> str:
-    """Return a canonical form of the URL for deduping."""
-    return url.split("?", 1)[0]
-
-
 def notify_blocked(site: str):
     """Send a Telegram notification when a site blocks access."""
     try:
@@ -56,22 +61,21 @@ KEYWORDS = [
     "principal product manager",
 ]
 
+# Lower-case substring every kept job's location must contain.
+LOCATION = "israel"
+
 
 def title_is_allowed(title: str, threshold: float = 0.7) -> bool:
     """Check fuzzy title allow list and block keywords"""
-    t = title.lower()
-    if any(b in t for b in BLOCK_KEYWORDS):
-        return False
-    best = max(difflib.SequenceMatcher(None, t, allow).ratio() for allow in ALLOW_TITLES)
-    return best >= threshold
+    return title_matcher.get_matcher(ALLOW_TITLES, BLOCK_KEYWORDS, threshold).allowed(title)
 
 
 def scrape_indeed(keyword: str):
+    today = date.today().isoformat()
     url = f"https://www.indeed.com/jobs?q={quote_plus(keyword)}&l=Israel"
-    r = requests.get(url, headers=HEADERS, timeout=20)
+    r = http_client.get(url, headers=HEADERS, provider="Indeed")
     r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
-    rows = []
+    soup = html_parse.parse_cards(r.text, "a", "tapItem")
     for card in soup.select("a.tapItem"):
         title = card.select_one("h2").get_text(" ", strip=True)
         company = card.select_one(".companyName").get_text(strip=True)
@@ -79,25 +83,24 @@ def scrape_indeed(keyword: str):
         if "israel" not in loc.lower():
             continue
         link = "https://www.indeed.com" + card["href"]
-        rows.append({
-            "title": html.unescape(title),
-            "company": company,
-            "location": loc,
-            "link": link,
-            "date": date.today().isoformat(),
-        })
-    return rows
+        yield Job(
+            title=html.unescape(title),
+            company=company,
+            location=loc,
+            link=link,
+            date=today,
+        )
 
 
 def scrape_linkedin(keyword: str):
+    today = date.today().isoformat()
     url = (
         "https://www.linkedin.com/jobs/search/?keywords="
         f"{quote_plus(keyword)}&location=Israel"
     )
-    r = requests.get(url, headers=HEADERS, timeout=20)
+    r = http_client.get(url, headers=HEADERS, provider="LinkedIn")
     r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
-    rows = []
+    soup = html_parse.parse_cards(r.text, "li", "jobs-search-results__list-item")
     for li in soup.select("li.jobs-search-results__list-item"):
         a = li.select_one("a.base-card__full-link")
         if not a:
@@ -108,25 +111,24 @@ def scrape_linkedin(keyword: str):
         if "israel" not in loc.lower():
             continue
         link = a["href"].split("?")[0]
-        rows.append({
-            "title": title,
-            "company": company,
-            "location": loc,
-            "link": link,
-            "date": date.today().isoformat(),
-        })
-    return rows
+        yield Job(
+            title=title,
+            company=company,
+            location=loc,
+            link=link,
+            date=today,
+        )
 
 
 def scrape_glassdoor(keyword: str):
+    today = date.today().isoformat()
     url = (
         "https://www.glassdoor.com/Job/jobs.htm?sc.keyword="
         f"{quote_plus(keyword)}&locT=N&locId=114&locName=Israel"
     )
-    r = requests.get(url, headers=HEADERS, timeout=20)
+    r = http_client.get(url, headers=HEADERS, provider="Glassdoor")
     r.raise_for_status()
-    soup = BeautifulSoup(r.text, "html.parser")
-    rows = []
+    soup = html_parse.parse_cards(r.text, "article", "react-job-listing")
     for card in soup.select("article.react-job-listing"):
         title_tag = card.select_one("a.jobLink span")
         if not title_tag:
@@ -135,166 +137,471 @@ def scrape_glassdoor(keyword: str):
         company = card.select_one("div.jobHeader a").get_text(" ", strip=True)
         loc = card.select_one("span.pr-xxsm").get_text(" ", strip=True)
         link = "https://www.glassdoor.com" + card.get("data-job-url", "")
-        rows.append({
-            "title": title,
-            "company": company,
-            "location": loc,
-            "link": link,
-            "date": date.today().isoformat(),
-        })
-    return rows
+        yield Job(
+            title=title,
+            company=company,
+            location=loc,
+            link=link,
+            date=today,
+        )
+
+
+JOBDATA_URL = "https://jobdataapi.com/api/jobs/?country_code=IL"
+# Query parameter JobdataAPI uses to return only postings on or after a date.
+JOBDATA_SINCE_PARAM = "min_date"
+JOBDATA_INCREMENTAL = os.getenv("JOBDATA_INCREMENTAL", "1") == "1"
+JOBDATA_MARK = "jobdata:high_water"
+JOBDATA_CHECKPOINT = "jobdata:checkpoint"
+# Prefix for the scrape marks (feeds, JobdataAPI) in sync_state. A run that
+# scrapes for a subset of profiles sets its own, so it neither reads nor
+# advances the marks the full run relies on. Other state stays shared.
+MARK_SCOPE = ""
+
+
+def _mark_key(key):
+    return f"{MARK_SCOPE}:{key}" if MARK_SCOPE else key
+
+
+def _jobdata_page(url, ttl=None):
+    r = http_cache.get(url, headers=HEADERS, provider="JobdataAPI", ttl=ttl)
+    r.raise_for_status()
+    data = r.json()
+    next_url = data.get("next")
+    if next_url and not next_url.startswith("http"):
+        next_url = "https://jobdataapi.com" + next_url
+    return data.get("results", data.get("jobs", [])), next_url
+
+
+def _jobdata_jobs(items, mark, seen):
+    """Yield the page's jobs newer than ``mark``; ``seen`` tracks the newest date."""
+    for item in items:
+        posted = item.get("date_posted") or ""
+        if mark and posted and posted <= mark:
+            continue
+        if posted > seen["newest"]:
+            seen["newest"] = posted
+        yield Job(
+            title=item.get("title", ""),
+            company=item.get("company_name", ""),
+            location=item.get("location", "Israel"),
+            link=item.get("apply_url") or item.get("url"),
+            date=posted[:10],
+        )
+
+
+def _newest_first(dates) -> bool:
+    return all(a >= b for a, b in zip(dates, dates[1:]))
 
 
 def scrape_jobdata_api(keyword: str):
-    """Fetch jobs from JobdataAPI REST endpoint."""
-    base = "https://jobdataapi.com/api/jobs/?country_code=IL"
-    url = base
-    jobs = []
+    """Fetch jobs from JobdataAPI REST endpoint.
+
+    In incremental mode only postings newer than the last run's newest
+    ``date_posted`` are requested and yielded. ``min_date`` only has day
+    granularity, so items are also compared against the full timestamp.
+    Paging stops early only on a newest-first page whose newest posting is
+    at or below the mark; an oldest-first listing is walked to the end.
+
+    The URLs walked so far are checkpointed after every page. A killed run
+    replays those pages from the disk cache (no requests) and continues from
+    the saved cursor. The checkpoint is removed as soon as the walk ends; the
+    new mark is staged and only written by ``sync_state.commit`` once the run
+    has saved its history.
+    """
+    mark_key, checkpoint_key = _mark_key(JOBDATA_MARK), _mark_key(JOBDATA_CHECKPOINT)
+    mark = sync_state.get(mark_key) if JOBDATA_INCREMENTAL else None
+    checkpoint = (sync_state.get(checkpoint_key) if JOBDATA_INCREMENTAL else None) or {}
+    seen = {"newest": mark or ""}
+    pages = list(checkpoint.get("pages", []))
+    for page_url in pages:
+        items, _ = _jobdata_page(page_url, ttl=float("inf"))
+        yield from _jobdata_jobs(items, mark, seen)
+    if checkpoint:
+        url = checkpoint.get("next")
+    else:
+        url = JOBDATA_URL + (f"&{JOBDATA_SINCE_PARAM}={mark[:10]}" if mark else "")
     while url:
-        r = requests.get(url, headers=HEADERS, timeout=20)
-        r.raise_for_status()
-        data = r.json()
-        for item in data.get("results", data.get("jobs", [])):
-            jobs.append(
-                {
-                    "title": item.get("title", ""),
-                    "company": item.get("company_name", ""),
-                    "location": item.get("location", "Israel"),
-                    "link": item.get("apply_url") or item.get("url"),
-                    "date": item.get("date_posted", "")[:10],
-                }
-            )
-        next_url = data.get("next")
-        if next_url and not next_url.startswith("http"):
-            next_url = "https://jobdataapi.com" + next_url
+        items, next_url = _jobdata_page(url)
+        yield from _jobdata_jobs(items, mark, seen)
+        pages.append(url)
+        if JOBDATA_INCREMENTAL:
+            sync_state.put(checkpoint_key, {"pages": pages, "next": next_url})
+        dates = [d for d in (item.get("date_posted") for item in items) if d]
+        if mark and dates and _newest_first(dates) and dates[0] <= mark:
+            break
         url = next_url
-    return jobs
+    if JOBDATA_INCREMENTAL:
+        if seen["newest"]:
+            sync_state.stage(mark_key, seen["newest"])
+        # Dropped now, not staged: the staged mark already makes a crash
+        # refetch these postings, and a checkpoint left behind would replay
+        # stale cached pages instead of asking for new ones.
+        sync_state.delete(checkpoint_key)
 
 
 def scrape_remotive(keyword: str):
     """Remote jobs from Remotive API."""
     url = "https://remotive.io/api/remote-jobs?search=israel"
-    r = requests.get(url, headers=HEADERS, timeout=20)
+    r = http_cache.get(url, headers=HEADERS, provider="Remotive")
     r.raise_for_status()
     data = r.json()
-    jobs = []
     for item in data.get("jobs", []):
-        jobs.append(
-            {
-                "title": item.get("title", ""),
-                "company": item.get("company_name", ""),
-                "location": item.get("candidate_required_location", "Remote, Israel"),
-                "link": item.get("url"),
-                "date": item.get("publication_date", "")[:10],
-            }
+        yield Job(
+            title=item.get("title", ""),
+            company=item.get("company_name", ""),
+            location=item.get("candidate_required_location", "Remote, Israel"),
+            link=item.get("url"),
+            date=item.get("publication_date", "")[:10],
         )
-    return jobs
 
 
 def scrape_jobicy(keyword: str):
     """Remote jobs from Jobicy API."""
     url = "https://jobicy.com/api/v2/remote-jobs?geo=israel"
-    r = requests.get(url, headers=HEADERS, timeout=20)
+    r = http_cache.get(url, headers=HEADERS, provider="Jobicy")
     r.raise_for_status()
     data = r.json()
-    jobs = []
     for item in data.get("jobs", []):
-        jobs.append(
-            {
-                "title": item.get("title", ""),
-                "company": item.get("company"),
-                "location": item.get("location", "Remote, Israel"),
-                "link": item.get("job_url") or item.get("url"),
-                "date": item.get("date" , "")[:10],
-            }
+        yield Job(
+            title=item.get("title", ""),
+            company=item.get("company"),
+            location=item.get("location", "Remote, Israel"),
+            link=item.get("job_url") or item.get("url"),
+            date=item.get("date", "")[:10],
         )
-    return jobs
+
+
+def _scrape_feed(site: str, url: str):
+    """Stream an RSS feed, stopping at items older than the last run's newest."""
+    r = http_cache.get(url, headers=HEADERS, provider=site)
+    r.raise_for_status()
+    key = _mark_key(f"feed:{site}")
+    since = feed_parse.parse_date(sync_state.get(key)) if feed_parse.INCREMENTAL else None
+    newest = since
+    with r.open() as body:
+        for item in feed_parse.iter_items(body, since):
+            published = feed_parse.parse_date(item.get("pubDate"))
+            if published is not None and (newest is None or published > newest):
+                newest = published
+            yield Job(
+                title=item.get("title", ""),
+                company="",
+                location="Israel",
+                link=item.get("link", ""),
+                # ISO day, as the other providers give, so Job.posted parses.
+                date=published.date().isoformat() if published else "",
+            )
+    # Only a fully consumed feed moves the mark forward, and only once the
+    # run has saved its history (sync_state.commit).
+    if newest is not None and newest != since:
+        sync_state.stage(key, newest.isoformat())
 
 
 def scrape_iitjobs(keyword: str):
     """Parse RSS feed from IITJobs."""
-    url = "https://www.iitjobs.com/jobs-in-israel/rss-jobs"
-    r = requests.get(url, headers=HEADERS, timeout=20)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "xml")
-    rows = []
-    for item in soup.select("item"):
-        rows.append(
-            {
-                "title": item.title.get_text(strip=True),
-                "company": "",
-                "location": "Israel",
-                "link": item.link.get_text(strip=True),
-                "date": item.pubDate.get_text(strip=True)[:16],
-            }
-        )
-    return rows
+    return _scrape_feed("IITJobs", "https://www.iitjobs.com/jobs-in-israel/rss-jobs")
 
 
 def scrape_craigslist(keyword: str):
     """Craigslist RSS feed for Israeli jobs via JobMob."""
-    url = "https://telaviv.craigslist.org/search/jjj?format=rss"
-    r = requests.get(url, headers=HEADERS, timeout=20)
-    r.raise_for_status()
-    soup = BeautifulSoup(r.text, "xml")
-    rows = []
-    for item in soup.select("item"):
-        rows.append(
-            {
-                "title": item.title.get_text(strip=True),
-                "company": "",
-                "location": "Israel",
-                "link": item.link.get_text(strip=True),
-                "date": item.pubDate.get_text(strip=True)[:16],
-            }
-        )
-    return rows
+    return _scrape_feed("Craigslist", "https://telaviv.craigslist.org/search/jjj?format=rss")
+
+
+# How a provider uses the search keyword:
+#   KEYWORD - one request per keyword (the site searches server side)
+#   BATCH   - one request for all keywords at once (func receives the list)
+#   GLOBAL  - the feed ignores keywords; fetched once, filtered locally
+KEYWORD = "keyword"
+BATCH = "batch"
+GLOBAL = "global"
+
+
+class Provider(NamedTuple):
+    site: str
+    func_name: str
+    scope: str = KEYWORD
 
 
 SCRAPERS = [
-    ("Indeed", "scrape_indeed"),
-    ("LinkedIn", "scrape_linkedin"),
-    ("Glassdoor", "scrape_glassdoor"),
-    ("JobdataAPI", "scrape_jobdata_api"),
-    ("Remotive", "scrape_remotive"),
-    ("Jobicy", "scrape_jobicy"),
-    ("IITJobs", "scrape_iitjobs"),
-    ("Craigslist", "scrape_craigslist"),
+    Provider("Indeed", "scrape_indeed"),
+    Provider("LinkedIn", "scrape_linkedin"),
+    Provider("Glassdoor", "scrape_glassdoor"),
+    Provider("JobdataAPI", "scrape_jobdata_api", GLOBAL),
+    Provider("Remotive", "scrape_remotive", GLOBAL),
+    Provider("Jobicy", "scrape_jobicy", GLOBAL),
+    Provider("IITJobs", "scrape_iitjobs", GLOBAL),
+    Provider("Craigslist", "scrape_craigslist", GLOBAL),
 ]
 
 
-def _keep(job, seen_set):
-    canonical = canonical_url(job["link"])
-    if canonical in seen_set:
+def matches_keywords(title: str, keywords) -> bool:
+    """Local stand-in for a server-side search: every word of some keyword occurs in the title."""
+    t = title.lower()
+    return any(all(w in t for w in kw.lower().split()) for kw in keywords)
+
+
+def _keep(job, seen_set, allowed=None, location=LOCATION):
+    link = canonical(job)
+    if link in seen_set:
+        metrics.count("filter_rejected_total", reason="dedup")
+        return False
+    if not (allowed or title_is_allowed)(job["title"]):
+        metrics.count("filter_rejected_total", reason="title")
         return False
-    if not title_is_allowed(job["title"]):
+    if location not in job["location"].lower():
+        metrics.count("filter_rejected_total", reason="location")
         return False
-    if "israel" not in job["location"].lower():
+    seen_set.add(link)
+    metrics.count("filter_kept_total")
+    return True
+
+
+# Providers run side by side; calls to the same provider (and therefore the
+# same host) stay sequential with RATE_LIMIT_SEC between them.
+MAX_WORKERS = int(os.getenv("SCRAPER_WORKERS", "8"))
+RATE_LIMIT_SEC = 1
+# Jobs buffered per call (ordered) or overall (unordered) before a worker
+# waits for the consumer; keeps peak memory flat however much a provider returns.
+QUEUE_SIZE = int(os.getenv("SCRAPER_QUEUE_SIZE", "256"))
+
+_DONE = object()
+
+
+class _Cancelled(Exception):
+    """Raised in a worker once the consumer has stopped reading."""
+
+
+class _Failure(NamedTuple):
+    name: str
+    exc: Exception
+
+
+def _calls_for(provider, keywords):
+    """Return the argument for each call the engine makes to a provider."""
+    if provider.scope == GLOBAL:
+        return [None]
+    if provider.scope == BATCH:
+        return [list(keywords)]
+    return list(keywords)
+
+
+def _timed_call(site, func, arg, health=None):
+    """Yield one scraper call's jobs, or a _Failure, recording its time and counts."""
+    jobs = 0
+    failed = False
+    with metrics.timer("scrape", site=site):
+        try:
+            for job in func(arg):
+                jobs += 1
+                yield job
+        except Exception as exc:
+            failed = True
+            metrics.count("scrape_failures_total", site=site)
+            yield _Failure(func.__name__, exc)
+        finally:
+            metrics.count("scrape_jobs_total", jobs, site=site)
+            if health is not None:
+                health.record(site, jobs, failed)
+
+
+def _circuit_open(site, health) -> bool:
+    if health is None or health.available(site):
         return False
-    seen_set.add(canonical)
+    metrics.count("scrape_skipped_total", site=site)
     return True
 
 
-def search_jobs(keywords=None, scrapers=None):
+def _feed_provider(site, func, calls, emit, health=None):
+    """Stream one scraper's jobs for each call, pausing between requests to its host.
+
+    Every call is closed with ``_DONE`` even if the worker itself fails, so
+    the consumer never waits on a call that will not finish.
+    """
+    k = 0
+    try:
+        for k, arg in enumerate(calls):
+            if _circuit_open(site, health):
+                emit(k, _DONE)
+                continue
+            if k:
+                time.sleep(RATE_LIMIT_SEC)
+            for item in _timed_call(site, func, arg, health):
+                emit(k, item)
+            emit(k, _DONE)
+    except _Cancelled:
+        return
+    except Exception as exc:
+        for j in range(k, len(calls)):
+            emit(j, _Failure(func.__name__, exc))
+            emit(j, _DONE)
+
+
+POLL_SEC = 0.5
+
+
+def _put(q, item, stop):
+    """Block while ``q`` is full, giving up once ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=POLL_SEC)
+            return
+        except queue.Full:
+            continue
+    raise _Cancelled
+
+
+def _get(q, futures):
+    """``q.get()`` that raises instead of blocking once the producing workers are gone."""
+    while True:
+        try:
+            return q.get(timeout=POLL_SEC)
+        except queue.Empty:
+            if all(f.done() for f in futures):
+                for f in futures:
+                    if f.exception() is not None:
+                        raise f.exception()
+                raise RuntimeError("scraper worker exited without finishing its calls")
+
+
+def _provider_stream(providers, keywords, concurrent, ordered, health=None):
+    """Yield (provider, call index, job or _Failure) from every provider."""
+    funcs = [globals()[p.func_name] for p in providers]
+    calls = [_calls_for(p, keywords) for p in providers]
+    # Keyword-major slot order; single-call providers slot in at the first keyword.
+    slots = [
+        (i, k)
+        for k in range(max(map(len, calls), default=0))
+        for i in range(len(providers))
+        if k < len(calls[i])
+    ]
+
+    if not concurrent or len(providers) < 2:
+        called = False
+        for i, k in slots:
+            if _circuit_open(providers[i].site, health):
+                continue
+            if called:
+                time.sleep(RATE_LIMIT_SEC)
+            called = True
+            for item in _timed_call(providers[i].site, funcs[i], calls[i][k], health):
+                yield providers[i], k, item
+        return
+
+    # With bounded queues an ordered run needs a thread per provider: a worker
+    # blocked on a later slot must not keep the provider of the current slot
+    # from starting.
+    workers = len(providers) if ordered else min(MAX_WORKERS, len(providers))
+    pool = ThreadPoolExecutor(max_workers=max(1, workers))
+    stop = threading.Event()
+    try:
+        if ordered:
+            queues = [[queue.Queue(QUEUE_SIZE) for _ in c] for c in calls]
+            futures = [
+                pool.submit(_feed_provider, providers[i].site, func, calls[i], lambda k, item, q=queues[i]: _put(q[k], item, stop), health)
+                for i, func in enumerate(funcs)
+            ]
+            for i, k in slots:
+                while (item := _get(queues[i][k], futures[i:i + 1])) is not _DONE:
+                    yield providers[i], k, item
+        else:
+            shared = queue.Queue(QUEUE_SIZE)
+            futures = [
+                pool.submit(_feed_provider, providers[i].site, func, calls[i], lambda k, item, i=i: _put(shared, (i, k, item), stop), health)
+                for i, func in enumerate(funcs)
+            ]
+            remaining = len(slots)
+            while remaining:
+                i, k, item = _get(shared, futures)
+                if item is _DONE:
+                    remaining -= 1
+                else:
+                    yield providers[i], k, item
+    finally:
+        stop.set()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def scrape(keywords=None, scrapers=None, concurrent=True, ordered=True, health=None, archive=None):
+    """Pipeline stage: yield raw jobs from every provider as they are parsed.
+
+    Failures are logged and reported once per site. With ``ordered`` the jobs
+    come out in the order of a sequential run, otherwise as soon as any
+    provider produces them. With a ``provider_health.ProviderHealth``,
+    providers still cooling down from earlier blocks are skipped, the rest
+    run healthiest first, and a provider is not called again in this run
+    once its circuit opens. Every job is also added to ``archive`` (a
+    ``job_archive.JobArchive``) before any filtering.
+    """
     keywords = keywords or KEYWORDS
-    scrapers = scrapers or SCRAPERS
-    seen = set()
-    jobs = []
+    providers = [p if isinstance(p, Provider) else Provider(*p) for p in (scrapers or SCRAPERS)]
+    if health is not None:
+        ready = health.schedule(providers)
+        for p in providers:
+            if p not in ready:
+                print(f"INFO: skipping {p.site}, blocked on recent runs")
+                metrics.count("scrape_skipped_total", site=p.site)
+        providers = ready
     blocked = set()
-    for kw in keywords:
-        for site, func_name in scrapers:
-            func = globals()[func_name]
-            try:
-                for job in func(kw):
-                    if _keep(job, seen):
-                        jobs.append(job)
-            except Exception as exc:
-                print(f"WARN: {func.__name__} failed for {kw} → {exc}")
-                if site not in blocked:
-                    notify_blocked(site)
-                    blocked.add(site)
-            time.sleep(1)
-    return jobs
+    for provider, k, item in _provider_stream(providers, keywords, concurrent, ordered, health):
+        if isinstance(item, _Failure):
+            label = keywords[k] if provider.scope == KEYWORD else "all keywords"
+            print(f"WARN: {item.name} failed for {label} → {item.exc}")
+            if provider.site not in blocked:
+                notify_blocked(provider.site)
+                blocked.add(provider.site)
+            continue
+        if archive is not None:
+            archive.add(item, provider.site)
+        if provider.scope == GLOBAL and not matches_keywords(item["title"], keywords):
+            metrics.count("filter_rejected_total", reason="keyword")
+            continue
+        yield item
+
+
+def filter_jobs(jobs, seen=None, allowed=None, location=LOCATION):
+    """Pipeline stage: drop repeats, disallowed titles and roles outside ``location``.
+
+    ``allowed`` is a title predicate; the default is ``title_is_allowed``.
+    """
+    seen = set() if seen is None else seen
+    return (job for job in jobs if _keep(job, seen, allowed, location))
+
+
+def skip_seen(jobs, history):
+    """Pipeline stage: drop jobs whose canonical link is already in ``history``."""
+    for job in jobs:
+        if history.is_seen(canonical(job)):
+            metrics.count("filter_rejected_total", reason="history")
+        else:
+            yield job
+
+
+def collapse_duplicates(jobs, index):
+    """Pipeline stage: one entry per posting across providers and days.
+
+    Later near-duplicates from this run are appended to the first entry's
+    ``alt_links``; ones matching a posting from an earlier run are dropped.
+    """
+    firsts = {}
+    for job in jobs:
+        hit = index.match(job)
+        if hit is None:
+            index.add(job)
+            firsts[job["link"]] = job
+            yield job
+        elif hit[1]:
+            metrics.count("filter_rejected_total", reason="duplicate")
+            firsts[hit[0]].setdefault("alt_links", []).append(job["link"])
+        else:
+            metrics.count("filter_rejected_total", reason="repost")
+
+
+def iter_jobs(keywords=None, scrapers=None, concurrent=True, ordered=True, health=None, archive=None):
+    return filter_jobs(scrape(keywords, scrapers, concurrent, ordered, health, archive))
+
+
+def search_jobs(keywords=None, scrapers=None, concurrent=True):
+    return list(iter_jobs(keywords, scrapers, concurrent))
 
 
 if __name__ == "__main__":
@@ -1,47 +1,156 @@
 
-import json, os
+import os
+import threading
 from pathlib import Path
 from datetime import date
 
-from job_search import search_jobs, canonical_url
-from bot_notify import send_message, await_reply, send_document
-from cv_tailor import tailor_cv
-from apply_via_email import send_application
+from job_search import scrape, skip_seen, collapse_duplicates, canonical_url
+from job_record import canonical
+from bot_notify import send_message, send_digest, await_reply, send_documents
+from history_store import HistoryStore
+from job_archive import JobArchive
+from profiles import PROFILES, scrape_keywords
+from provider_health import ProviderHealth
+from task_queue import DONE, FAILED, PermanentError
+import metrics
+import sync_state
 
-HISTORY_FILE = Path("history.json")
+RUN_REPORT = Path("run_report.json")
 
-def load_history():
-    if HISTORY_FILE.exists():
-        return json.loads(HISTORY_FILE.read_text())
-    return {"seen_links": [], "applied_links": []}
+def load_history(profile):
+    """Open a profile's history store, importing its old JSON history on first use."""
+    return HistoryStore(profile.history_db, legacy_json=profile.history_json)
 
-def save_history(hist):
-    HISTORY_FILE.write_text(json.dumps(hist, indent=2))
+def run(profiles=None, report=RUN_REPORT, histories=None):
+    """Scrape once for every profile, then send each profile its own digest.
 
-def run():
-    hist = load_history()
-    new_jobs = [j for j in search_jobs() if canonical_url(j["link"]) not in hist["seen_links"]]
+    ``histories`` maps profile names to already open HistoryStores (the
+    daemon keeps them open between cycles); others are opened for this run.
+    """
+    metrics.reset()
+    try:
+        _run(profiles or PROFILES, histories or {})
+    finally:
+        metrics.write_report(report)
+
+def _run(profiles, histories):
+    with metrics.timer("stage", stage="search"), JobArchive() as archive:
+        health = ProviderHealth.load()
+        jobs = list(scrape(scrape_keywords(profiles), health=health, archive=archive))
+        health.save()
+    for profile in profiles:
+        if profile.name in histories:
+            _run_profile(profile, jobs, histories[profile.name])
+            continue
+        with load_history(profile) as hist:
+            _run_profile(profile, jobs, hist)
+    # Feed marks cover the shared scrape, so they wait for every profile's history.
+    sync_state.commit()
+
+def _run_profile(profile, jobs, hist):
+    _apply(hist, profile)
+    with metrics.timer("stage", stage="select", profile=profile.name):
+        dedup = hist.dedup_index()
+        candidates = list(collapse_duplicates(skip_seen(profile.select(jobs), hist), dedup))
+        new_jobs = profile.rank(candidates, _cv_text()) if candidates else []
+    metrics.count("digest_jobs_total", len(new_jobs), profile=profile.name)
     if not new_jobs:
-        send_message("🏖 No new jobs today — have fun at the beach!")
-        print("INFO: sent beach message")
-        return        
-    msg_lines = [f"🌍 New roles for {date.today().isoformat()}"]
-    for idx, job in enumerate(new_jobs, 1):
-        msg_lines.append(f"{idx}. {job['title']} — {job['company']} — {job['location']}")
-        msg_lines.append(job["link"])
-    send_message("\n".join(msg_lines))
-    choice_text = await_reply()
+        _remember(hist, dedup, new_jobs)
+        send_message(profile.empty_message)
+        print(f"INFO: sent no-job message for {profile.name}")
+        return
+    blocks = [
+        f"{idx}. {job['title']} — {job['company']} — {job['location']}\n{job['link']}"
+        + "".join(f"\nalso: {alt}" for alt in job.get("alt_links", ()))
+        for idx, job in enumerate(new_jobs, 1)
+    ]
+    with metrics.timer("stage", stage="send_digest", profile=profile.name):
+        send_digest(f"{profile.header} {date.today().isoformat()}", blocks)
+    with metrics.timer("stage", stage="await_reply", profile=profile.name):
+        choice_text = await_reply()
     chosen_idxs = {int(x) for x in choice_text.replace(',', ' ').split() if x.isdigit()}
-    for idx in chosen_idxs:
-        if 1 <= idx <= len(new_jobs):
-            job = new_jobs[idx-1]
-            cv_path = tailor_cv(job)
-            send_document(cv_path, caption=f"CV for {job['company']}")
-            if os.getenv("GMAIL_USER") and os.getenv("GMAIL_APP_PASSWORD"):
-                send_application(job, cv_path)
-            hist["applied_links"].append(canonical_url(job["link"]))
-    hist["seen_links"].extend(canonical_url(j["link"]) for j in new_jobs)
-    save_history(hist)
+    chosen = [new_jobs[idx - 1] for idx in sorted(chosen_idxs) if 1 <= idx <= len(new_jobs)]
+    _apply(hist, profile, chosen)
+    _remember(hist, dedup, new_jobs)
+
+def _apply(hist, profile, chosen=()):
+    """Queue the application steps for ``chosen`` and run every unfinished step.
+
+    Steps left over from an interrupted run are picked up here too. Each
+    step runs its ready tasks as one batch: CVs through the tailoring
+    process pool, uploads as rate-limited albums, emails over one session.
+    """
+    # Only needed once something was chosen; keeps startup light.
+    from cv_tailor import tailor_cvs
+    from apply_via_email import Mailer, send_applications
+    from smtplib import SMTPAuthenticationError
+
+    tasks = hist.task_queue()
+    email = bool(os.getenv("GMAIL_USER") and os.getenv("GMAIL_APP_PASSWORD"))
+    for job in chosen:
+        link = canonical(job)
+        payload = {"job": dict(job), "email": email}
+        tasks.add(f"tailor:{link}", "tailor", payload)
+        tasks.add(f"send_document:{link}", "send_document", payload, after=f"tailor:{link}")
+        if email:
+            tasks.add(f"send_application:{link}", "send_application", payload, after=f"tailor:{link}")
+
+    mailer = Mailer()
+    mail_lock = threading.Lock()
+
+    def tailor(items):
+        with metrics.timer("stage", stage="tailor_cvs", profile=profile.name):
+            return [str(path) for path in tailor_cvs([payload["job"] for payload, _ in items])]
+
+    def upload(items):
+        with metrics.timer("stage", stage="send_documents", profile=profile.name):
+            send_documents((cv_path, f"CV for {payload['job']['company']}") for payload, cv_path in items)
+        return [None] * len(items)
+
+    def apply(items):
+        with mail_lock, metrics.timer("stage", stage="send_applications", profile=profile.name):
+            results = send_applications([(payload["job"], cv_path) for payload, cv_path in items], mailer)
+        return [
+            None if result.ok
+            else PermanentError(result.error) if isinstance(result.error, SMTPAuthenticationError)
+            else result.error
+            for result in results
+        ]
+
+    def on_done(task):
+        job = task.payload["job"]
+        if task.state == FAILED:
+            print(f"WARN: {task.step} for {job['company']} failed → {task.error}")
+        if task.step == "send_application":
+            metrics.count("applications_total", ok=task.state == DONE, profile=profile.name)
+        applied = "send_application" if task.payload["email"] else "tailor"
+        if task.step == applied and task.state == DONE:
+            hist.mark_applied(canonical(job))
+
+    try:
+        tasks.run(
+            {"tailor": tailor, "send_document": upload, "send_application": apply},
+            attempts={"tailor": 2},
+            at_most_once=("send_application",),
+            on_done=on_done,
+            batch=("tailor", "send_document", "send_application"),
+        )
+    finally:
+        mailer.close()
+    tasks.prune()
+
+def _remember(hist, dedup, shown):
+    """Mark the digest's jobs seen; ones cut by the ranking can still show up later."""
+    hist.mark_seen(link for j in shown for link in [canonical(j), *map(canonical_url, j.get("alt_links", ()))])
+    dedup.save({j["link"] for j in shown})
+
+def _cv_text():
+    try:
+        from cv_tailor import base_cv_text
+        return base_cv_text()
+    except Exception as exc:  # the CV only sharpens the ranking
+        print(f"WARN: ranking without the base CV → {exc}")
+        return ""
 
 if __name__ == "__main__":
     run()
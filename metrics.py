@@ -0,0 +1,113 @@
+"""In-process counters and timers for a run, exported as JSON or Prometheus text.
+
+Instrumented code calls ``count(...)`` and ``timer(...)`` against the shared
+registry; ``write_report`` dumps it as the run report (``RUN_REPORT``) and
+``write_prometheus`` as a node-exporter textfile (``METRICS_PROM_FILE``).
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+RUN_REPORT = Path(os.getenv("RUN_REPORT", "run_report.json"))
+PROM_FILE = os.getenv("METRICS_PROM_FILE")
+PREFIX = "jobbot_"
+
+
+def _escape(value) -> str:
+    """Escape a label value for the Prometheus text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = datetime.now().isoformat(timespec="seconds")
+            self._t0 = time.perf_counter()
+            self.counters = {}
+            self.timers = {}
+
+    def count(self, name, n=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def observe(self, name, seconds, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            calls, total, peak = self.timers.get(key, (0, 0.0, 0.0))
+            self.timers[key] = (calls + 1, total + seconds, max(peak, seconds))
+
+    @contextmanager
+    def timer(self, name, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def report(self):
+        with self._lock:
+            return {
+                "started": self.started,
+                "duration_seconds": round(time.perf_counter() - self._t0, 3),
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self.counters.items())
+                ],
+                "timers": [
+                    {"name": name, "labels": dict(labels), "count": calls,
+                     "total_seconds": round(total, 4), "max_seconds": round(peak, 4)}
+                    for (name, labels), (calls, total, peak) in sorted(self.timers.items())
+                ],
+            }
+
+    def prometheus(self):
+        """Render the registry in the Prometheus text exposition format."""
+
+        def series(name, labels, value):
+            if labels:
+                inner = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+                return f"{PREFIX}{name}{{{inner}}} {value}"
+            return f"{PREFIX}{name} {value}"
+
+        lines = []
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                lines.append(series(name, labels, value))
+            for (name, labels), (calls, total, _) in sorted(self.timers.items()):
+                lines.append(series(f"{name}_seconds_count", labels, calls))
+                lines.append(series(f"{name}_seconds_sum", labels, round(total, 6)))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+count = REGISTRY.count
+observe = REGISTRY.observe
+timer = REGISTRY.timer
+reset = REGISTRY.reset
+report = REGISTRY.report
+
+
+def write_report(path=None, prom_path=None):
+    """Write the JSON run report and, if configured, the Prometheus textfile."""
+    path = Path(path or RUN_REPORT)
+    path.write_text(json.dumps(REGISTRY.report(), indent=2))
+    prom_path = prom_path or PROM_FILE
+    if prom_path:
+        tmp = Path(f"{prom_path}.tmp")
+        tmp.write_text(REGISTRY.prometheus())
+        os.replace(tmp, prom_path)
+    return path
@@ -0,0 +1,90 @@
+"""Search profiles sharing one scrape.
+
+A profile is one digest: its own title allow/block lists, location and
+(optionally) keywords, with its own history database. The runner scrapes the
+union of every profile's keywords once and hands each profile a copy of the
+shared result set, so another profile costs filtering, not network.
+"""
+
+import os
+from pathlib import Path
+from typing import NamedTuple, Optional, Tuple
+
+import job_search
+import ranking
+import title_matcher
+
+# "rank" gates titles by relevance score (ranking.py); "fuzzy" keeps the
+# per-title allow/block matcher.
+TITLE_GATE = os.getenv("TITLE_GATE", "rank")
+
+
+class Profile(NamedTuple):
+    name: str
+    history_db: Path
+    header: str
+    empty_message: str
+    # Older runs kept history in JSON; it is imported on first open.
+    history_json: Optional[Path] = None
+    # Empty means job_search.KEYWORDS with no extra title filter.
+    keywords: Tuple[str, ...] = ()
+    allow_titles: Tuple[str, ...] = tuple(job_search.ALLOW_TITLES)
+    block_keywords: Tuple[str, ...] = tuple(job_search.BLOCK_KEYWORDS)
+    location: str = job_search.LOCATION
+    # Extra phrases that should rank a posting higher (skills, domains, companies).
+    preferences: Tuple[str, ...] = ()
+    gate: str = TITLE_GATE
+
+    def title_allowed(self, title: str) -> bool:
+        if self.gate == "rank":
+            # Scored as a batch in rank().
+            return True
+        return title_matcher.get_matcher(self.allow_titles, self.block_keywords).allowed(title)
+
+    def rank(self, jobs, cv_text=""):
+        """Pipeline stage: the digest, best match first and cut to ``ranking.TOP_N``."""
+        return ranking.rank(jobs, self, gate=self.gate == "rank", cv_text=cv_text)
+
+    def select(self, jobs):
+        """Pipeline stage: this profile's view of the shared scrape.
+
+        Jobs are copied, so later stages may annotate them without leaking
+        into other profiles.
+        """
+        jobs = (job.copy() for job in jobs)
+        if self.keywords:
+            jobs = (job for job in jobs if job_search.matches_keywords(job["title"], self.keywords))
+        return job_search.filter_jobs(jobs, allowed=self.title_allowed, location=self.location)
+
+
+PROFILES = [
+    Profile(
+        "global",
+        Path("history.db"),
+        "🌍 New roles for",
+        "🏖 No new jobs today — have fun at the beach!",
+        history_json=Path("history.json"),
+    ),
+    Profile(
+        "local",
+        Path("history_local.db"),
+        "🏠 Local roles for",
+        "🏖 No new local jobs today — have fun!",
+        history_json=Path("history_local.json"),
+    ),
+]
+
+
+def by_name(*names):
+    """The profiles called ``names``, in that order; KeyError for unknown ones."""
+    known = {p.name: p for p in PROFILES}
+    return [known[name] for name in names]
+
+
+def scrape_keywords(profiles):
+    """Every keyword any of ``profiles`` needs, each once, in first-seen order."""
+    keywords = {}
+    for profile in profiles:
+        for kw in profile.keywords or job_search.KEYWORDS:
+            keywords.setdefault(kw, None)
+    return list(keywords)
@@ -0,0 +1,90 @@
+"""Per-provider circuit breaker and scheduling order.
+
+Within a run, a provider whose calls fail ``FAILURES_TO_OPEN`` times is not
+called again, so a blocked site stops costing a timeout per keyword. Across
+runs, a provider whose every call failed is skipped for a cooldown that
+doubles with each consecutive blocked run (capped at ``MAX_COOLDOWN_HOURS``);
+the first run after the cooldown tries it again. Providers that delivered the
+most jobs per call recently are scheduled first.
+
+State lives in ``sync_state`` under ``STATE_KEY``.
+"""
+
+import os
+import threading
+import time
+
+import sync_state
+
+# http_client has already retried transient errors by the time a call fails.
+FAILURES_TO_OPEN = int(os.getenv("CIRCUIT_FAILURES", "1"))
+COOLDOWN_HOURS = float(os.getenv("CIRCUIT_COOLDOWN_HOURS", "6"))
+MAX_COOLDOWN_HOURS = 7 * 24
+# Weight of the latest run in the jobs-per-call moving average.
+YIELD_WEIGHT = 0.3
+STATE_KEY = "provider_health"
+
+
+class ProviderHealth:
+    def __init__(self, state=None, now=None):
+        self.state = {site: dict(entry) for site, entry in (state or {}).items()}
+        self.now = time.time() if now is None else now
+        self._run = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls):
+        return cls(sync_state.get(STATE_KEY, {}))
+
+    def save(self):
+        sync_state.put(STATE_KEY, self.finish())
+
+    def _entry(self, site):
+        return self.state.setdefault(site, {"blocked_runs": 0, "open_until": 0, "yield": None})
+
+    def cooling_down(self, site) -> bool:
+        """True while a circuit opened by earlier runs is still open."""
+        return self.state.get(site, {}).get("open_until", 0) > self.now
+
+    def available(self, site) -> bool:
+        with self._lock:
+            failures = self._run.get(site, {}).get("failures", 0)
+        return failures < FAILURES_TO_OPEN and not self.cooling_down(site)
+
+    def record(self, site, jobs, failed):
+        with self._lock:
+            run = self._run.setdefault(site, {"calls": 0, "failures": 0, "jobs": 0})
+            run["calls"] += 1
+            run["jobs"] += jobs
+            run["failures"] += bool(failed)
+
+    def score(self, site) -> float:
+        entry = self.state.get(site, {})
+        # Unknown providers go first so they get a yield estimate.
+        expected = entry.get("yield")
+        expected = float("inf") if expected is None else expected
+        return expected / (1 + entry.get("blocked_runs", 0))
+
+    def schedule(self, providers):
+        """Drop providers that are cooling down; order the rest healthiest first."""
+        ready = [p for p in providers if not self.cooling_down(p.site)]
+        return sorted(ready, key=lambda p: -self.score(p.site))
+
+    def finish(self):
+        """Fold this run's results into the persistent state and return it."""
+        with self._lock:
+            for site, run in self._run.items():
+                entry = self._entry(site)
+                if run["failures"] and run["failures"] >= run["calls"]:
+                    entry["blocked_runs"] += 1
+                    hours = min(MAX_COOLDOWN_HOURS, COOLDOWN_HOURS * 2 ** (entry["blocked_runs"] - 1))
+                    entry["open_until"] = self.now + hours * 3600
+                else:
+                    entry["blocked_runs"] = 0
+                    entry["open_until"] = 0
+                    ok_calls = run["calls"] - run["failures"]
+                    latest = run["jobs"] / ok_calls
+                    old = entry["yield"]
+                    entry["yield"] = latest if old is None else (1 - YIELD_WEIGHT) * old + YIELD_WEIGHT * latest
+            self._run.clear()
+            return self.state
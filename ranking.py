@@ -0,0 +1,138 @@
+"""Relevance ranking for the digest.
+
+Each candidate is scored with BM25 against a query built from its profile.
+The allow titles, keywords and preferences carry most of the weight, and the
+base CV's text carries ``CV_WEIGHT`` of it. Block keywords count
+``BLOCK_WEIGHT`` each. Terms are word unigrams plus adjacent bigrams. A
+posting's title counts ``TITLE_WEIGHT`` times, and its company and location
+count once each.
+
+With NumPy the batch is scored as one sparse matrix-vector product over the
+(posting, term) pairs the query cares about. Without NumPy the same formula
+runs in pure Python.
+
+The gate keeps postings that score at least ``MIN_RELATIVE`` times the
+weakest of the profile's allow titles, scored as a posting in the same
+batch. So the bar moves with the batch's term statistics instead of being
+a fixed per-title similarity.
+"""
+
+import math
+import os
+from collections import Counter
+from functools import lru_cache
+
+import metrics
+from dedup_index import tokens
+
+K1 = 1.2
+B = 0.75
+TITLE_WEIGHT = 2
+CV_WEIGHT = 0.2
+BLOCK_WEIGHT = -1.0
+MIN_RELATIVE = float(os.getenv("RANK_MIN_RELATIVE", "0.5"))
+# Longest digest; 0 keeps every posting that passes the gate.
+TOP_N = int(os.getenv("RANK_TOP_N", "25"))
+
+
+def features(text) -> Counter:
+    words = tokens(text)
+    return Counter(words + [f"{a} {b}" for a, b in zip(words, words[1:])])
+
+
+def document(job) -> Counter:
+    doc = Counter()
+    for term, n in features(job.get("title")).items():
+        doc[term] += TITLE_WEIGHT * n
+    doc.update(features(job.get("company")))
+    doc.update(features(job.get("location")))
+    return doc
+
+
+def _share(counts, total):
+    size = sum(counts.values())
+    return {term: total * n / size for term, n in counts.items()} if size else {}
+
+
+def query(profile, cv_text="") -> dict:
+    """Term weights for ``profile``; positive weights sum to 1."""
+    wanted = Counter()
+    for text in (*profile.allow_titles, *profile.keywords, *profile.preferences):
+        wanted.update(features(text))
+    cv = features(cv_text)
+    weights = Counter(_share(wanted, 1.0 - CV_WEIGHT if cv else 1.0))
+    weights.update(_share(cv, CV_WEIGHT))
+    for text in profile.block_keywords:
+        words = tokens(text)
+        # A phrase blocks as a whole: "machine learning", not every "learning".
+        for term in [f"{a} {b}" for a, b in zip(words, words[1:])] or words:
+            weights[term] = BLOCK_WEIGHT
+    return dict(weights)
+
+
+@lru_cache(maxsize=None)
+def _numpy():
+    """NumPy, or None without it; imported on first use so startup stays light."""
+    try:
+        import numpy
+    except ImportError:  # pragma: no cover - depends on the environment
+        return None
+    return numpy
+
+
+def bm25(docs, weights):
+    """Score every document (a term Counter) against query ``weights``."""
+    n = len(docs)
+    if not n or not weights:
+        return [0.0] * n
+    terms = list(weights)
+    column = {term: j for j, term in enumerate(terms)}
+    lengths = [sum(doc.values()) for doc in docs]
+    avgdl = sum(lengths) / n or 1.0
+    pairs = [(i, column[term], tf) for i, doc in enumerate(docs) for term, tf in doc.items() if term in column]
+    np = _numpy()
+    if np is None:
+        return _bm25_python(n, terms, weights, lengths, avgdl, pairs)
+    if pairs:
+        rows, cols, tf = (np.array(values) for values in zip(*pairs))
+    else:
+        rows = cols = np.zeros(0, dtype=np.intp)
+        tf = np.zeros(0)
+    tf = tf.astype(float)
+    df = np.bincount(cols, minlength=len(terms))
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    norm = K1 * (1 - B + B * np.asarray(lengths, dtype=float) / avgdl)
+    q = np.array([weights[term] for term in terms])
+    contrib = idf[cols] * tf * (K1 + 1) / (tf + norm[rows]) * q[cols]
+    return np.bincount(rows, weights=contrib, minlength=n).tolist()
+
+
+def _bm25_python(n, terms, weights, lengths, avgdl, pairs):
+    df = Counter(j for _, j, _ in pairs)
+    scores = [0.0] * n
+    for i, j, tf in pairs:
+        idf = math.log1p((n - df[j] + 0.5) / (df[j] + 0.5))
+        norm = K1 * (1 - B + B * lengths[i] / avgdl)
+        scores[i] += idf * tf * (K1 + 1) / (tf + norm) * weights[terms[j]]
+    return scores
+
+
+def rank(jobs, profile, top_n=None, gate=True, cv_text=""):
+    """``jobs`` best first, at most ``top_n`` of them (default ``TOP_N``; 0 for all).
+
+    With ``gate``, postings scoring below the bar described in the module
+    docstring are dropped.
+    """
+    jobs = list(jobs)
+    refs = [{"title": title} for title in profile.allow_titles] if gate else []
+    scores = bm25([document(job) for job in jobs + refs], query(profile, cv_text))
+    scores, ref_scores = scores[:len(jobs)], scores[len(jobs):]
+    floor = MIN_RELATIVE * min(ref_scores) if ref_scores else -math.inf
+    order = sorted((i for i in range(len(jobs)) if scores[i] >= floor), key=lambda i: -scores[i])
+    if len(order) < len(jobs):
+        metrics.count("filter_rejected_total", len(jobs) - len(order), reason="rank")
+    top_n = TOP_N if top_n is None else top_n
+    if top_n and len(order) > top_n:
+        metrics.count("filter_rejected_total", len(order) - top_n, reason="top_n")
+        order = order[:top_n]
+    return [jobs[i] for i in order]
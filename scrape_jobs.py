@@ -1,8 +1,24 @@
+"""Relocation search across Indeed regions, streamed as JSON lines.
+
+Every target (an Indeed domain and a location on it) is searched for
+``QUERY``. Its result pages are followed with ``start=`` until a page brings
+nothing new or ``MAX_PAGES`` is reached. Targets run in parallel, with at most
+``PER_HOST`` requests in flight per domain. Each posting is printed once, as
+soon as it is parsed. A failed target prints an ``{"error": ...}`` line and
+the others carry on.
+"""
+
+import argparse
 import json
-from urllib.parse import quote_plus
+import os
+import queue
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, quote_plus, urlsplit
 
-import requests
-from bs4 import BeautifulSoup
+import html_parse
+import http_client
 
 HEADERS = {
     "User-Agent": (
@@ -13,28 +29,142 @@ HEADERS = {
     "Accept-Language": "en-US,en;q=0.9",
 }
 
+QUERY = "product manager relocation"
+# "domain=location" pairs separated by ";"; an empty location searches the whole domain.
+TARGETS = os.getenv(
+    "RELOCATION_TARGETS",
+    "www.indeed.com=;uk.indeed.com=United Kingdom;de.indeed.com=Deutschland;"
+    "nl.indeed.com=Nederland;ca.indeed.com=Canada;au.indeed.com=Australia",
+)
+MAX_PAGES = int(os.getenv("RELOCATION_MAX_PAGES", "5"))
+PER_HOST = int(os.getenv("RELOCATION_PER_HOST", "2"))
+MAX_WORKERS = int(os.getenv("RELOCATION_WORKERS", "8"))
+PAGE_SIZE = 10
+
+_DONE = object()
+
+
+def parse_targets(spec):
+    """``"host=location;..."`` -> [(host, location), ...]."""
+    targets = []
+    for part in spec.split(";"):
+        host, _, location = part.strip().partition("=")
+        if host:
+            targets.append((host.strip(), location.strip()))
+    return targets
 
-def main():
-    query = quote_plus("product manager relocation")
-    url = f"https://www.indeed.com/jobs?q={query}"
-    try:
-        r = requests.get(url, headers=HEADERS, timeout=20)
-        r.raise_for_status()
-    except Exception as exc:
-        print(json.dumps({"error": f"Failed to fetch results: {exc}"}))
-        return
 
-    soup = BeautifulSoup(r.text, "html.parser")
-    rows = []
+def page_url(host, location, query, start):
+    url = f"https://{host}/jobs?q={quote_plus(query)}"
+    if location:
+        url += f"&l={quote_plus(location)}"
+    return url + (f"&start={start}" if start else "")
+
+
+def job_key(link):
+    """Indeed's ``jk`` id when the link has one, so one posting reached through
+    different tracking URLs or regions is printed once."""
+    jk = parse_qs(urlsplit(link).query).get("jk")
+    return jk[0] if jk else link.split("?", 1)[0]
+
+
+def parse_page(text, host, location):
+    soup = html_parse.parse_cards(text, "a", "tapItem")
     for card in soup.select("a.tapItem"):
         title = card.select_one("h2").get_text(" ", strip=True)
-        if "relocation" not in title.lower():
-            continue
         company = card.select_one(".companyName").get_text(strip=True)
         loc = card.select_one(".companyLocation").get_text(strip=True)
-        link = "https://www.indeed.com" + card["href"]
-        rows.append({"title": title, "company": company, "location": loc, "link": link})
-    print(json.dumps(rows, indent=2))
+        yield {
+            "title": title,
+            "company": company,
+            "location": loc,
+            "link": f"https://{host}" + card["href"],
+            "region": location or host,
+        }
+
+
+class Crawler:
+    def __init__(self, query=QUERY, max_pages=MAX_PAGES, per_host=PER_HOST):
+        self.query = query
+        self.max_pages = max_pages
+        self.per_host = per_host
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, host):
+        with self._lock:
+            return self._hosts.setdefault(host, threading.BoundedSemaphore(self.per_host))
+
+    def _fetch(self, url, host):
+        with self._slot(host):
+            r = http_client.get(url, headers=HEADERS, provider="Indeed")
+        r.raise_for_status()
+        return r.text
+
+    def crawl_target(self, host, location, emit):
+        """Emit every posting of one target, page by page."""
+        seen = set()
+        for page in range(self.max_pages):
+            url = page_url(host, location, self.query, page * PAGE_SIZE)
+            try:
+                rows = list(parse_page(self._fetch(url, host), host, location))
+            except Exception as exc:
+                emit({"error": f"Failed to fetch results: {exc}", "url": url})
+                return
+            fresh = [row for row in rows if job_key(row["link"]) not in seen]
+            # Indeed repeats its last page past the end of the results.
+            if not fresh:
+                return
+            for row in fresh:
+                seen.add(job_key(row["link"]))
+                emit(row)
+            if len(rows) < PAGE_SIZE:
+                return
+
+    def crawl(self, targets, workers=MAX_WORKERS):
+        """Yield postings from every target as they arrive, each posting once."""
+        out = queue.Queue()
+        pool = ThreadPoolExecutor(max(1, min(workers, len(targets) or 1)))
+
+        def run(host, location):
+            try:
+                self.crawl_target(host, location, out.put)
+            finally:
+                out.put(_DONE)
+
+        for host, location in targets:
+            pool.submit(run, host, location)
+        printed = set()
+        remaining = len(targets)
+        try:
+            while remaining:
+                row = out.get()
+                if row is _DONE:
+                    remaining -= 1
+                    continue
+                if "error" not in row:
+                    key = job_key(row["link"])
+                    if key in printed:
+                        continue
+                    printed.add(key)
+                yield row
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--query", default=QUERY)
+    parser.add_argument("--targets", default=TARGETS, help='"domain=location;..." pairs')
+    parser.add_argument("--pages", type=int, default=MAX_PAGES, help="result pages per target")
+    parser.add_argument("--per-host", type=int, default=PER_HOST, help="concurrent requests per domain")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    args = parser.parse_args(argv)
+
+    crawler = Crawler(args.query, args.pages, args.per_host)
+    for row in crawler.crawl(parse_targets(args.targets), args.workers):
+        sys.stdout.write(json.dumps(row, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,24 @@
+import json
 import os
 from bot_notify import send_document
 
+RUN_REPORTS = ('run_report.json', 'run_report_local.json')
+
+
+def report_caption(path):
+    """One-line summary of a run report for the Telegram caption."""
+    try:
+        with open(path) as f:
+            report = json.load(f)
+    except (OSError, ValueError):
+        return 'Run report'
+    # Summed over profiles.
+    new_jobs = sum(c['value'] for c in report.get('counters', []) if c['name'] == 'digest_jobs_total')
+    return (
+        f"Run report: {new_jobs} new jobs, "
+        f"{report.get('duration_seconds', 0):.0f}s"
+    )
+
 
 def main():
     if os.path.exists('pytest.log'):
@@ -13,6 +31,12 @@ def main():
             send_document('bot.log', caption='Bot logs')
         except Exception as exc:
             print('WARN: failed to send bot log →', exc)
+    for path in RUN_REPORTS:
+        if os.path.exists(path):
+            try:
+                send_document(path, caption=report_caption(path))
+            except Exception as exc:
+                print('WARN: failed to send run report →', exc)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,82 @@
+"""Small persistent key/value store for per-provider sync marks.
+
+Scrapers record how far they got (the newest feed item, an API cursor) so the
+next run can stop where the last one left off. Values must be JSON
+serialisable; every write replaces ``STATE_FILE`` atomically.
+
+Marks that are only safe once the run's history has been saved are
+``stage``d and written by ``commit``; a run that dies first leaves the old
+marks in place and the next run fetches those postings again.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+STATE_FILE = Path(os.getenv("SYNC_STATE_FILE", ".sync_state.json"))
+
+_lock = threading.Lock()
+_DELETE = object()
+_pending = {}
+
+
+def _load():
+    try:
+        return json.loads(STATE_FILE.read_text() or "{}")
+    except (OSError, ValueError):
+        return {}
+
+
+def _save(state):
+    STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=STATE_FILE.parent, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, STATE_FILE)
+
+
+def get(key, default=None):
+    with _lock:
+        return _load().get(key, default)
+
+
+def put(key, value):
+    with _lock:
+        state = _load()
+        state[key] = value
+        _save(state)
+
+
+def delete(key):
+    with _lock:
+        state = _load()
+        if state.pop(key, None) is not None:
+            _save(state)
+
+
+def stage(key, value):
+    """Hold ``value`` for ``key`` until ``commit``; ``None`` deletes the key then."""
+    with _lock:
+        _pending[key] = _DELETE if value is None else value
+
+
+def commit():
+    """Write every staged value."""
+    with _lock:
+        if not _pending:
+            return
+        state = _load()
+        for key, value in _pending.items():
+            if value is _DELETE:
+                state.pop(key, None)
+            else:
+                state[key] = value
+        _save(state)
+        _pending.clear()
+
+
+def discard():
+    with _lock:
+        _pending.clear()
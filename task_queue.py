@@ -0,0 +1,247 @@
+"""Durable queue of application steps.
+
+Each step (tailor a CV, upload it, email the application) is a row keyed by
+an idempotency key such as ``tailor:<canonical link>``. Adding a key that
+already exists does nothing unless that task failed, so re-running a batch
+redoes only what is unfinished. A task may wait for another (``after``); its
+handler then receives that task's result.
+
+``run`` hands ready tasks to a bounded thread pool, so independent
+applications overlap. Steps listed in ``batch`` get all their ready tasks in
+one handler call, for work that is cheaper in bulk (a process pool, an
+album upload, one SMTP session). A failed attempt is retried after
+``RETRY_DELAY_SEC * attempts`` until the step's attempt limit is reached.
+All database writes happen on the calling thread. A task left ``running`` by
+a crash goes back to pending on the next ``run``, except for steps listed in
+``at_most_once``: those are marked failed, because the crash may have come
+after the side effect (an email) and before the row was updated.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timedelta
+from typing import NamedTuple, Optional
+
+WORKERS = int(os.getenv("QUEUE_WORKERS", "4"))
+MAX_ATTEMPTS = 3
+RETRY_DELAY_SEC = 5.0
+MAX_AGE_DAYS = 30
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class PermanentError(Exception):
+    """Raised by a handler when retrying cannot help.
+
+    Every other pending task of the same step fails with the same error, as
+    with a rejected SMTP login.
+    """
+
+
+class Task(NamedTuple):
+    key: str
+    step: str
+    payload: dict
+    after: Optional[str]
+    state: str
+    attempts: int
+    result: object
+    error: Optional[str]
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _outcomes(future, batched, n):
+    """One result or exception per task of a finished handler call."""
+    exc = future.exception()
+    if exc is not None:
+        return [exc] * n
+    if not batched:
+        return [future.result()]
+    outcomes = list(future.result())
+    if len(outcomes) != n:
+        return [RuntimeError(f"batch handler returned {len(outcomes)} outcomes for {n} tasks")] * n
+    return outcomes
+
+
+class TaskQueue:
+    def __init__(self, conn):
+        self._conn = conn
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                " key TEXT PRIMARY KEY,"
+                " step TEXT NOT NULL,"
+                " payload TEXT NOT NULL,"
+                " after TEXT,"
+                " state TEXT NOT NULL,"
+                " attempts INTEGER NOT NULL DEFAULT 0,"
+                " not_before REAL NOT NULL DEFAULT 0,"
+                " result TEXT,"
+                " error TEXT,"
+                " updated TEXT NOT NULL"
+                ")"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS tasks_state ON tasks (state)")
+
+    def add(self, key, step, payload, after=None) -> bool:
+        """Queue a task; True if it is new or a failed one was re-armed."""
+        with self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO tasks (key, step, payload, after, state, updated) VALUES (?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET state = excluded.state, attempts = 0,"
+                " not_before = 0, error = NULL, updated = excluded.updated"
+                " WHERE tasks.state = 'failed'",
+                (key, step, json.dumps(payload), after, PENDING, _now()),
+            )
+        return cur.rowcount > 0
+
+    def tasks(self, state=None):
+        sql = "SELECT key, step, payload, after, state, attempts, result, error FROM tasks"
+        rows = self._conn.execute(sql + " WHERE state = ?" if state else sql, (state,) if state else ())
+        return [self._task(row) for row in rows]
+
+    def get(self, key) -> Optional[Task]:
+        row = self._conn.execute(
+            "SELECT key, step, payload, after, state, attempts, result, error FROM tasks WHERE key = ?", (key,)
+        ).fetchone()
+        return self._task(row) if row else None
+
+    @staticmethod
+    def _task(row):
+        key, step, payload, after, state, attempts, result, error = row
+        return Task(key, step, json.loads(payload), after, state, attempts,
+                    None if result is None else json.loads(result), error)
+
+    def _set(self, key, state, **fields):
+        fields.update(state=state, updated=_now())
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._conn:
+            self._conn.execute(f"UPDATE tasks SET {columns} WHERE key = ?", (*fields.values(), key))
+
+    def _recover(self, at_most_once):
+        with self._conn:
+            marks = ",".join("?" * len(at_most_once))
+            if at_most_once:
+                self._conn.execute(
+                    f"UPDATE tasks SET state = ?, error = ?, updated = ? WHERE state = ? AND step IN ({marks})",
+                    (FAILED, "interrupted; may already have run", _now(), RUNNING, *at_most_once),
+                )
+            self._conn.execute("UPDATE tasks SET state = ? WHERE state = ?", (PENDING, RUNNING))
+
+    def _fail_orphans(self):
+        """Fail pending tasks whose dependency failed; return their keys."""
+        keys = [row[0] for row in self._conn.execute(
+            "SELECT key FROM tasks WHERE state = ? AND after IN (SELECT key FROM tasks WHERE state = ?)",
+            (PENDING, FAILED),
+        )]
+        for key in keys:
+            self._set(key, FAILED, error="dependency failed")
+        return keys
+
+    def _ready(self, steps, now):
+        """Pending tasks of ``steps`` whose dependency is done, with its result."""
+        marks = ",".join("?" * len(steps))
+        rows = self._conn.execute(
+            "SELECT t.key, t.step, t.payload, t.after, t.state, t.attempts, t.result, t.error, d.result"
+            " FROM tasks t LEFT JOIN tasks d ON d.key = t.after"
+            f" WHERE t.state = ? AND t.step IN ({marks}) AND t.not_before <= ?"
+            " AND (t.after IS NULL OR d.state = ?) ORDER BY t.rowid",
+            (PENDING, *steps, now, DONE),
+        ).fetchall()
+        return [(self._task(row[:8]), None if row[8] is None else json.loads(row[8])) for row in rows]
+
+    def _next_retry(self, steps, now):
+        marks = ",".join("?" * len(steps))
+        row = self._conn.execute(
+            f"SELECT MIN(not_before) FROM tasks WHERE state = ? AND step IN ({marks}) AND not_before > ?",
+            (PENDING, *steps, now),
+        ).fetchone()
+        return row[0]
+
+    def run(self, handlers, workers=None, attempts=None, at_most_once=(), on_done=None, batch=()):
+        """Process every runnable task; return when none is left to start or wait for.
+
+        ``handlers`` maps a step to ``handler(payload, upstream_result)``,
+        whose JSON-serialisable return value becomes the task's result. A
+        step in ``batch`` is called as ``handler([(payload, upstream_result), ...])``
+        and returns one outcome per item, in order: its result, or the
+        exception it failed with. Raising fails every item of the call.
+        ``attempts`` maps a step to its attempt limit (default MAX_ATTEMPTS).
+        ``on_done(task)`` is called on this thread once a task is done or has
+        finally failed.
+        """
+        attempts = attempts or {}
+        steps = tuple(handlers)
+        limit = max(1, workers or WORKERS)
+        notify = on_done or (lambda task: None)
+        self._recover(tuple(at_most_once))
+        running = {}
+        with ThreadPoolExecutor(limit) as pool:
+            while True:
+                for key in self._fail_orphans():
+                    notify(self.get(key))
+                for group in self._groups(self._ready(steps, time.time()), batch)[:limit - len(running)]:
+                    for task, _ in group:
+                        self._set(task.key, RUNNING, attempts=task.attempts + 1)
+                    step = group[0][0].step
+                    if step in batch:
+                        future = pool.submit(handlers[step], [(task.payload, upstream) for task, upstream in group])
+                    else:
+                        future = pool.submit(handlers[step], group[0][0].payload, group[0][1])
+                    running[future] = (step in batch, [task.key for task, _ in group])
+                if not running:
+                    retry_at = self._next_retry(steps, time.time())
+                    if retry_at is None:
+                        return
+                    time.sleep(max(0.0, retry_at - time.time()))
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    batched, keys = running.pop(future)
+                    for key, outcome in zip(keys, _outcomes(future, batched, len(keys))):
+                        for final in self._finish(key, outcome, attempts):
+                            notify(self.get(final))
+
+    @staticmethod
+    def _groups(ready, batch):
+        """Split ready tasks into handler calls: one per batched step, one per other task."""
+        batches, singles = {}, []
+        for task, upstream in ready:
+            if task.step in batch:
+                batches.setdefault(task.step, []).append((task, upstream))
+            else:
+                singles.append([(task, upstream)])
+        return list(batches.values()) + singles
+
+    def _finish(self, key, outcome, attempts):
+        """Record one attempt; return the keys of tasks that are now final."""
+        task = self.get(key)
+        if not isinstance(outcome, Exception):
+            self._set(key, DONE, result=json.dumps(outcome), error=None)
+            return [key]
+        exc = outcome
+        if isinstance(exc, PermanentError):
+            keys = [key] + [t.key for t in self.tasks(PENDING) if t.step == task.step]
+            for other in keys:
+                self._set(other, FAILED, error=str(exc))
+            return keys
+        if task.attempts < attempts.get(task.step, MAX_ATTEMPTS):
+            print(f"WARN: {key} failed (attempt {task.attempts}) → {exc}")
+            self._set(key, PENDING, error=str(exc), not_before=time.time() + RETRY_DELAY_SEC * task.attempts)
+            return []
+        self._set(key, FAILED, error=str(exc))
+        return [key]
+
+    def prune(self, days=MAX_AGE_DAYS):
+        """Forget finished tasks older than ``days``; their keys can be queued again."""
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat(timespec="seconds")
+        with self._conn:
+            self._conn.execute("DELETE FROM tasks WHERE state IN (?, ?) AND updated < ?", (DONE, FAILED, cutoff))
@@ -0,0 +1,119 @@
+"""Async Telegram client for digests and CV uploads.
+
+Requests still go through the pooled ``http_client`` sessions; each call runs
+in a worker thread so uploads overlap. A token bucket per chat keeps us under
+Telegram's rate limit, long digests are split on job boundaries to fit the
+4096-character message limit, and documents go out as ``sendMediaGroup``
+albums of up to ten files.
+"""
+
+import asyncio
+import json
+import os
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+import http_client
+
+MAX_MESSAGE_LEN = 4096
+MAX_MEDIA_GROUP = 10
+# Telegram allows about one message per second in a single chat.
+CHAT_RATE = float(os.getenv("TELEGRAM_CHAT_RATE", "1"))
+CHAT_BURST = int(os.getenv("TELEGRAM_CHAT_BURST", "3"))
+
+
+def chunk_digest(header, blocks, limit=MAX_MESSAGE_LEN):
+    """Pack ``header`` and the per-job ``blocks`` into messages of at most ``limit`` chars.
+
+    A block is never split unless it alone is longer than ``limit``.
+    """
+    chunks, current = [], header
+    for block in blocks:
+        pieces = [block[i:i + limit] for i in range(0, len(block), limit)] or [""]
+        for piece in pieces:
+            candidate = f"{current}\n{piece}" if current else piece
+            if len(candidate) <= limit:
+                current = candidate
+            else:
+                if current:
+                    chunks.append(current)
+                current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``capacity``."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncTelegram:
+    def __init__(self, api_url, chat_id, rate=None, burst=None):
+        self.api_url = api_url
+        self.chat_id = chat_id
+        self.bucket = TokenBucket(CHAT_RATE if rate is None else rate, CHAT_BURST if burst is None else burst)
+
+    async def _post(self, method, **kwargs):
+        await self.bucket.acquire()
+        resp = await asyncio.to_thread(
+            http_client.post, f"{self.api_url}/{method}", provider="Telegram",
+            retries=http_client.MAX_RETRIES, **kwargs
+        )
+        resp.raise_for_status()
+        return resp
+
+    async def send_message(self, text):
+        return await self._post("sendMessage", json={"chat_id": self.chat_id, "text": text})
+
+    async def send_digest(self, header, blocks):
+        """Send the digest as as many messages as it needs, in order."""
+        for chunk in chunk_digest(header, blocks):
+            await self.send_message(chunk)
+
+    async def send_document(self, path, caption=None):
+        with open(path, "rb") as f:
+            return await self._post(
+                "sendDocument",
+                data={"chat_id": self.chat_id, "caption": caption or ""},
+                files={"document": f},
+            )
+
+    async def _send_group(self, docs):
+        if len(docs) == 1:
+            return await self.send_document(*docs[0])
+        with ExitStack() as stack:
+            files, media = {}, []
+            for n, (path, caption) in enumerate(docs):
+                name = f"doc{n}"
+                files[name] = (Path(path).name, stack.enter_context(open(path, "rb")))
+                media.append({"type": "document", "media": f"attach://{name}", "caption": caption or ""})
+            return await self._post(
+                "sendMediaGroup",
+                data={"chat_id": self.chat_id, "media": json.dumps(media)},
+                files=files,
+            )
+
+    async def send_documents(self, docs):
+        """Upload ``(path, caption)`` pairs as albums of up to ten, concurrently."""
+        docs = list(docs)
+        groups = [docs[i:i + MAX_MEDIA_GROUP] for i in range(0, len(docs), MAX_MEDIA_GROUP)]
+        return await asyncio.gather(*(self._send_group(g) for g in groups))
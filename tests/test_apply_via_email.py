@@ -0,0 +1,89 @@
+import smtplib
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import apply_via_email
+
+
+class FakeSMTP:
+    """Local stand-in for smtplib.SMTP; ``drop_after`` sends, then disconnects once."""
+
+    instances = []
+    drop_after = None
+
+    def __init__(self, host, port, timeout=None):
+        self.logins = []
+        self.sent = []
+        FakeSMTP.instances.append(self)
+
+    def login(self, user, password):
+        self.logins.append(user)
+
+    def send_message(self, msg):
+        if FakeSMTP.drop_after is not None and len(self.sent) == FakeSMTP.drop_after:
+            FakeSMTP.drop_after = None
+            raise smtplib.SMTPServerDisconnected("closed")
+        self.sent.append(msg["Subject"])
+
+    def quit(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def _pairs(tmp_path, n):
+    cv = tmp_path / "cv.docx"
+    cv.write_bytes(b"cv")
+    return [({"title": f"PM {i}", "company": "Acme"}, cv) for i in range(n)]
+
+
+def test_batch_reuses_session_and_reconnects(tmp_path, monkeypatch):
+    monkeypatch.setattr(smtplib, "SMTP", FakeSMTP)
+    FakeSMTP.instances = []
+    FakeSMTP.drop_after = 2
+    mailer = apply_via_email.Mailer(host="localhost", port=1025, user="me", password="pw", use_ssl=False)
+
+    results = apply_via_email.send_applications(_pairs(tmp_path, 4), mailer)
+
+    assert [r.ok for r in results] == [True] * 4
+    assert [len(s.sent) for s in FakeSMTP.instances] == [2, 2]
+    assert [s.logins for s in FakeSMTP.instances] == [["me"], ["me"]]
+
+
+def test_failures_are_reported_per_message(tmp_path, monkeypatch):
+    class Refusing(FakeSMTP):
+        def send_message(self, msg):
+            if msg["Subject"].startswith("PM 1"):
+                raise smtplib.SMTPRecipientsRefused({})
+            super().send_message(msg)
+
+    monkeypatch.setattr(smtplib, "SMTP", Refusing)
+    FakeSMTP.drop_after = None
+    mailer = apply_via_email.Mailer(host="localhost", port=1025, user="", password="", use_ssl=False)
+
+    results = apply_via_email.send_applications(_pairs(tmp_path, 3), mailer)
+    assert [r.ok for r in results] == [True, False, True]
+    assert isinstance(results[1].error, smtplib.SMTPRecipientsRefused)
+
+
+def test_auth_failure_stops_batch_and_results_stream(tmp_path, monkeypatch):
+    class BadLogin(FakeSMTP):
+        def login(self, user, password):
+            super().login(user, password)
+            raise smtplib.SMTPAuthenticationError(535, b"bad credentials")
+
+    monkeypatch.setattr(smtplib, "SMTP", BadLogin)
+    FakeSMTP.instances = []
+    FakeSMTP.drop_after = None
+    mailer = apply_via_email.Mailer(host="localhost", port=1025, user="me", password="bad", use_ssl=False)
+    streamed = []
+
+    results = apply_via_email.send_applications(_pairs(tmp_path, 3), mailer, on_result=streamed.append)
+
+    assert len(FakeSMTP.instances) == 1
+    assert [r.ok for r in results] == [False] * 3
+    assert streamed == results
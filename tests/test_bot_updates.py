@@ -0,0 +1,105 @@
+import json
+import sys
+import types
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import bot_notify
+import bot_updates
+
+
+class FakeTelegram:
+    """In-memory getUpdates endpoint that honours ``offset``."""
+
+    def __init__(self, updates):
+        self.updates = updates
+        self.calls = []
+
+    def get(self, url, params=None, **kwargs):
+        self.calls.append(dict(params))
+        offset = params.get("offset", 0)
+        batch = [u for u in self.updates if u["update_id"] >= offset]
+        return types.SimpleNamespace(raise_for_status=lambda: None, json=lambda: {"ok": True, "result": batch})
+
+
+@pytest.fixture
+def state(tmp_path, monkeypatch):
+    monkeypatch.setattr(bot_updates.sync_state, "STATE_FILE", tmp_path / "state.json")
+
+
+def test_whole_batch_dispatched_and_offset_persisted(state, monkeypatch):
+    server = FakeTelegram([
+        {"update_id": 7, "message": {"text": "hi"}},
+        {"update_id": 8, "edited_message": {"text": "1"}},
+        {"update_id": 9, "message": {"sticker": {}}},
+    ])
+    monkeypatch.setattr(bot_updates.http_client, "get", server.get)
+    seen = []
+
+    bot_updates.UpdateListener("http://tg", [lambda u: seen.append(u["update_id"])]).poll_once()
+    assert seen == [7, 8, 9]
+    assert server.calls[0]["timeout"] == bot_updates.POLL_TIMEOUT
+
+    bot_updates.UpdateListener("http://tg", [seen.append]).poll_once()
+    assert server.calls[1]["offset"] == 10
+    assert seen == [7, 8, 9]
+
+
+def test_await_reply_skips_non_text_updates(state, monkeypatch):
+    server = FakeTelegram([
+        {"update_id": 1, "message": {"photo": []}},
+        {"update_id": 2, "message": {"text": "1, 3"}},
+        {"update_id": 3, "message": {"text": "thanks"}},
+    ])
+    monkeypatch.setattr(bot_updates.http_client, "get", server.get)
+    assert bot_notify.await_reply(timeout_sec=60, webhook=False) == "1, 3"
+    assert len(server.calls) == 1
+
+
+def test_webhook_server_dispatches_posted_updates(state):
+    seen = []
+    listener = bot_updates.UpdateListener("http://tg", [seen.append])
+    server = listener.serve_webhook(port=0, path="/hook")
+    try:
+        port = server.server_address[1]
+        body = json.dumps({"update_id": 5, "message": {"text": "2"}}).encode()
+        forged = urllib.request.Request(f"http://127.0.0.1:{port}/hook", data=body, method="POST")
+        with pytest.raises(urllib.error.HTTPError) as err:
+            urllib.request.urlopen(forged)
+        assert err.value.code == 403
+        assert seen == []
+
+        req = urllib.request.Request(
+            f"http://127.0.0.1:{port}/hook", data=body, method="POST",
+            headers={bot_updates.SECRET_HEADER: listener.webhook_secret},
+        )
+        with urllib.request.urlopen(req) as resp:
+            assert resp.status == 200
+    finally:
+        server.shutdown()
+    assert bot_updates.message_text(seen[0]) == "2"
+    assert bot_updates.sync_state.get(bot_updates.OFFSET_KEY) == 6
+
+
+def test_webhook_mode_registers_and_removes_webhook(state, monkeypatch):
+    calls = []
+
+    def fake_post(url, json=None, **kwargs):
+        calls.append((url.rsplit("/", 1)[-1], json))
+        return types.SimpleNamespace(raise_for_status=lambda: None)
+
+    monkeypatch.setattr(bot_updates.http_client, "post", fake_post)
+    monkeypatch.setattr(bot_updates, "WEBHOOK_URL", "https://bot.example.com/")
+    monkeypatch.setattr(bot_updates, "WEBHOOK_PORT", 0)
+
+    assert bot_notify.await_reply(timeout_sec=0, webhook=True) == ""
+    assert [method for method, _ in calls] == ["setWebhook", "deleteWebhook"]
+    assert calls[0][1]["secret_token"]
@@ -0,0 +1,31 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import cv_tailor
+
+
+class Run:
+    def __init__(self, text):
+        self.text = text
+
+
+class Paragraph:
+    def __init__(self, *texts):
+        self.runs = [Run(t) for t in texts]
+
+
+def test_split_placeholders_are_gathered_into_one_run():
+    p = Paragraph("Applying for {{job", "_ti", "tle}} at {{comp", "any}}!", " {{location}}")
+    slots = cv_tailor._gather_placeholders(p)
+    assert [r.text for r in p.runs] == ["Applying for {{job_title}}", "", " at {{company}}", "!", " {{location}}"]
+    assert [r.text for r in slots] == ["Applying for {{job_title}}", " at {{company}}", " {{location}}"]
+
+
+def test_output_paths_are_unique_per_posting():
+    a = cv_tailor.output_path({"company": "Acme Ltd.", "link": "http://example.com/1"})
+    b = cv_tailor.output_path({"company": "Acme Ltd.", "link": "http://example.com/2"})
+    assert a != b
+    assert a.name.startswith("cv_acme_ltd_")
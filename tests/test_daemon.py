@@ -0,0 +1,58 @@
+import sys
+import threading
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import daemon
+import main
+import sync_state
+
+
+class FakeHistory:
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_cycles_reuse_open_histories_and_survive_failures(monkeypatch):
+    opened = []
+
+    def load_history(profile):
+        opened.append(FakeHistory(profile.name))
+        return opened[-1]
+
+    calls = []
+
+    def run(profiles, histories):
+        calls.append(dict(histories))
+        if len(calls) == 1:
+            sync_state.stage("feed:Test", "stale")
+            raise RuntimeError("provider exploded")
+
+    monkeypatch.setattr(main, "load_history", load_history)
+    monkeypatch.setattr(main, "run", run)
+    monkeypatch.setattr(daemon.http_client, "close_all", lambda: None)
+
+    daemon.serve(interval_min=0, cycles=3)
+
+    assert len(calls) == 3
+    assert all(c == calls[0] for c in calls)
+    assert sorted(calls[0]) == ["global", "local"]
+    assert all(h.closed for h in opened) and len(opened) == 2
+    assert "feed:Test" not in sync_state._pending
+
+
+def test_stop_event_ends_the_wait(monkeypatch):
+    stop = threading.Event()
+    monkeypatch.setattr(main, "load_history", FakeHistory)
+    monkeypatch.setattr(main, "run", lambda profiles, histories: stop.set())
+    monkeypatch.setattr(daemon.http_client, "close_all", lambda: None)
+    daemon.serve(interval_min=60, stop=stop)
@@ -0,0 +1,67 @@
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import job_search
+from history_store import HistoryStore
+
+
+def _job(link, company, title, location="Tel Aviv, Israel"):
+    return {"link": link, "company": company, "title": title, "location": location}
+
+
+def test_same_posting_from_several_providers_collapses(tmp_path):
+    with HistoryStore(tmp_path / "history.db") as hist:
+        index = hist.dedup_index()
+        jobs = [
+            _job("http://indeed/1", "Acme Ltd", "Senior Product Manager"),
+            _job("http://linkedin/9", "ACME", "Sr. Product Manager", "Tel Aviv-Yafo, Israel"),
+            _job("http://glassdoor/3", "Acme", "Staff Product Manager"),
+            _job("http://indeed/2", "Globex", "Senior Product Manager"),
+            _job("http://feed/1", "", "Senior Product Manager"),
+            _job("http://feed/2", "", "Senior Product Manager"),
+        ]
+        out = list(job_search.collapse_duplicates(jobs, index))
+
+    assert [j["link"] for j in out] == [
+        "http://indeed/1", "http://glassdoor/3", "http://indeed/2", "http://feed/1", "http://feed/2",
+    ]
+    assert out[0]["alt_links"] == ["http://linkedin/9"]
+
+
+def test_reposts_on_a_later_day_are_dropped(tmp_path):
+    db = tmp_path / "history.db"
+    with HistoryStore(db) as hist:
+        index = hist.dedup_index()
+        list(job_search.collapse_duplicates([_job("http://indeed/1", "Acme", "Product Manager, Payments")], index))
+        index.save()
+
+    with HistoryStore(db) as hist:
+        index = hist.dedup_index()
+        jobs = [
+            _job("http://indeed/77", "Acme", "Product Manager - Payments", "Tel Aviv"),
+            _job("http://indeed/78", "Acme", "Product Manager, Growth"),
+        ]
+        out = list(job_search.collapse_duplicates(jobs, index))
+    assert [j["link"] for j in out] == ["http://indeed/78"]
+
+
+def test_save_keeps_only_the_given_links(tmp_path):
+    db = tmp_path / "history.db"
+    jobs = [
+        _job("http://indeed/1", "Acme", "Product Manager, Payments"),
+        _job("http://indeed/2", "Beta", "Product Owner"),
+    ]
+    with HistoryStore(db) as hist:
+        index = hist.dedup_index()
+        list(job_search.collapse_duplicates(jobs, index))
+        index.save({"http://indeed/1"})
+
+    with HistoryStore(db) as hist:
+        out = list(job_search.collapse_duplicates(jobs, hist.dedup_index()))
+    assert [j["link"] for j in out] == ["http://indeed/2"]
@@ -0,0 +1,62 @@
+import io
+import sys
+import types
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import feed_parse
+import job_search
+
+
+def _feed(*days):
+    items = "".join(
+        f"<item><title>Product Manager {d}</title><link>http://example.com/{d}</link>"
+        f"<pubDate>{d:02d} Jun 2025 08:00:00 GMT</pubDate></item>"
+        for d in days
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>x</title>{items}</channel></rss>'.encode()
+
+
+def test_iter_items_yields_fields_and_stops_at_since():
+    since = datetime(2025, 6, 2, tzinfo=timezone.utc)
+    items = list(feed_parse.iter_items(io.BytesIO(_feed(4, 3, 2, 1)), since))
+    assert [i["link"] for i in items] == [
+        "http://example.com/4", "http://example.com/3", "http://example.com/2",
+    ]
+    assert items[0]["title"] == "Product Manager 4"
+
+
+class FeedResponse:
+    def __init__(self, body):
+        self._body = body
+
+    def raise_for_status(self):
+        pass
+
+    def open(self):
+        return io.BytesIO(self._body)
+
+
+def test_feed_scraper_resumes_after_last_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_search.sync_state, "STATE_FILE", tmp_path / "state.json")
+    monkeypatch.setattr(job_search.feed_parse, "INCREMENTAL", True)
+    bodies = [_feed(2, 1), _feed(4, 3, 2, 1)]
+    monkeypatch.setattr(job_search.http_cache, "get", lambda url, **kw: FeedResponse(bodies.pop(0)))
+
+    first = list(job_search.scrape_craigslist(None))
+    assert job_search.sync_state.get("feed:Craigslist") is None  # not saved before history
+    job_search.sync_state.commit()
+    second = list(job_search.scrape_craigslist(None))
+    job_search.sync_state.commit()
+
+    assert len(first) == 2
+    assert [j.posted.isoformat() for j in first] == ["2025-06-02", "2025-06-01"]
+    assert [j["link"] for j in second] == [
+        "http://example.com/4", "http://example.com/3", "http://example.com/2",
+    ]
+    assert job_search.sync_state.get("feed:Craigslist").startswith("2025-06-04")
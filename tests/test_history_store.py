@@ -0,0 +1,30 @@
+import json
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from history_store import HistoryStore
+
+
+def test_migrates_legacy_json(tmp_path):
+    legacy = tmp_path / "history.json"
+    legacy.write_text(json.dumps({"seen_links": ["http://a", "http://b"], "applied_links": ["http://a"]}))
+
+    with HistoryStore(tmp_path / "history.db", legacy_json=legacy) as hist:
+        assert hist.is_seen("http://b")
+        assert hist.is_applied("http://a")
+        assert not hist.is_applied("http://b")
+
+    assert not legacy.exists()
+    assert (tmp_path / "history.json.migrated").exists()
+
+
+def test_appends_persist_across_reopen(tmp_path):
+    db = tmp_path / "history.db"
+    with HistoryStore(db) as hist:
+        hist.mark_seen(["http://x", "http://x", "http://y"])
+    with HistoryStore(db) as hist:
+        assert sorted(hist.links()) == ["http://x", "http://y"]
+        assert not hist.is_seen("http://z")
@@ -0,0 +1,72 @@
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import http_cache
+
+
+class FakeResponse:
+    def __init__(self, status, body=b"", headers=None):
+        self.status_code = status
+        self.headers = headers or {}
+        self.encoding = "utf-8"
+        self._body = body
+
+    def iter_content(self, size):
+        yield self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "CACHE_DIR", tmp_path)
+    monkeypatch.delenv("HTTP_CACHE_REPLAY", raising=False)
+    sent = []
+    replies = []
+
+    def fake_get(url, headers=None, **kwargs):
+        sent.append(headers)
+        return replies.pop(0)
+
+    monkeypatch.setattr(http_cache.http_client, "get", fake_get)
+    return sent, replies
+
+
+def test_not_modified_replays_cached_body(cache):
+    sent, replies = cache
+    replies.append(FakeResponse(200, b'{"jobs": [1]}', {"ETag": '"v1"'}))
+    replies.append(FakeResponse(304))
+
+    first = http_cache.get("https://example.com/api", ttl=0)
+    second = http_cache.get("https://example.com/api", ttl=0)
+
+    assert not first.from_cache
+    assert second.from_cache and second.json() == {"jobs": [1]}
+    assert sent[1]["If-None-Match"] == '"v1"'
+
+
+def test_fresh_entry_skips_network(cache):
+    sent, replies = cache
+    replies.append(FakeResponse(200, b"<rss/>"))
+    http_cache.get("https://example.com/rss", ttl=3600)
+    assert http_cache.get("https://example.com/rss", ttl=3600).text == "<rss/>"
+    assert len(sent) == 1
+
+
+def test_replay_mode_never_hits_network(cache, monkeypatch):
+    monkeypatch.setenv("HTTP_CACHE_REPLAY", "1")
+    with pytest.raises(http_cache.CacheMiss):
+        http_cache.get("https://example.com/unknown")
@@ -0,0 +1,91 @@
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import http_client
+
+
+class FakeResponse:
+    def __init__(self, status):
+        self.status_code = status
+        self.headers = {}
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.statuses = list(statuses)
+        self.calls = []
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.calls.append((method, url, timeout))
+        return FakeResponse(self.statuses.pop(0))
+
+
+def _patch(monkeypatch, session):
+    monkeypatch.setattr(http_client, "session_for", lambda url: session)
+    monkeypatch.setattr(http_client.time, "sleep", lambda s: None)
+    errors = types.SimpleNamespace(ConnectionError=ConnectionError, Timeout=TimeoutError)
+    monkeypatch.setattr(http_client, "requests", errors)
+
+
+def test_retries_transient_status(monkeypatch):
+    session = FakeSession([503, 502, 200])
+    _patch(monkeypatch, session)
+    resp = http_client.get("https://example.com/feed", provider="IITJobs")
+    assert resp.status_code == 200
+    assert len(session.calls) == 3
+    assert session.calls[0][2] == http_client.TIMEOUTS["IITJobs"]
+
+
+def test_client_error_is_not_retried(monkeypatch):
+    session = FakeSession([404])
+    _patch(monkeypatch, session)
+    assert http_client.get("https://example.com/missing").status_code == 404
+    assert len(session.calls) == 1
+
+
+def test_backoff_is_capped_and_honours_retry_after():
+    assert 0 <= http_client.backoff_delay(20) <= http_client.BACKOFF_MAX
+    assert http_client.backoff_delay(0, "7") == 7
+
+
+class TimeoutSession(FakeSession):
+    def request(self, method, url, timeout=None, **kwargs):
+        self.calls.append((method, url, timeout))
+        if self.statuses:
+            return FakeResponse(self.statuses.pop(0))
+        raise TimeoutError("read timed out")
+
+
+def test_timeouts_are_not_retried_by_default(monkeypatch):
+    session = TimeoutSession([])
+    _patch(monkeypatch, session)
+    with pytest.raises(TimeoutError):
+        http_client.get("https://blocked.example/jobs")
+    assert len(session.calls) == 1
+
+
+def test_post_is_only_resent_after_a_429(monkeypatch):
+    session = TimeoutSession([])
+    _patch(monkeypatch, session)
+    with pytest.raises(TimeoutError):
+        http_client.post("https://api.example/sendMessage", retries=3)
+    assert len(session.calls) == 1
+
+    session = FakeSession([503])
+    _patch(monkeypatch, session)
+    assert http_client.post("https://api.example/sendMessage").status_code == 503
+    session = FakeSession([429, 200])
+    _patch(monkeypatch, session)
+    assert http_client.post("https://api.example/sendMessage", retries=3).status_code == 200
+    assert len(session.calls) == 2
@@ -0,0 +1,50 @@
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import job_archive
+import job_search
+from job_archive import JobArchive
+
+
+def _job(n, title, company, location, posted):
+    return {"title": title, "company": company, "location": location,
+            "link": f"http://example.com/{n}?ref=x", "date": posted}
+
+
+def test_search_by_words_columns_and_dates(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_archive, "BATCH_SIZE", 2)
+    with JobArchive(tmp_path / "a.db") as archive:
+        archive.add(_job(1, "Staff Product Manager", "Acme", "Haifa, Israel", "2024-08-02"), "Indeed")
+        archive.add(_job(2, "Staff Product Manager", "Globex", "Tel Aviv, Israel", "2024-08-03"), "LinkedIn")
+        archive.add(_job(3, "Product Designer", "Acme", "Haifa, Israel", "2024-02-01"), "Indeed")
+        archive.add(_job(1, "Staff Product Manager", "Acme", "Haifa, Israel", "2024-08-02"), "LinkedIn")
+
+    with JobArchive(tmp_path / "a.db") as archive:
+        rows = archive.search("staff product", location="haifa", since="2024-07-01", until="2024-09-30")
+        assert [(r["link"], r["site"]) for r in rows] == [("http://example.com/1", "Indeed")]
+        assert [r["link"] for r in archive.search(company="acme")] == [
+            "http://example.com/1", "http://example.com/3"]
+        assert [r["link"] for r in archive.search(site="LinkedIn")] == ["http://example.com/2"]
+        assert archive.companies("product manager") == [("Acme", 1), ("Globex", 1)]
+        assert archive.search('manager" OR "designer') == []
+
+
+def test_scrape_archives_every_job_before_filtering(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_search, "time", types.ModuleType("time"))
+    job_search.time.sleep = lambda s: None
+    monkeypatch.setattr(job_search, "scrape_remotive", lambda kw: [
+        _job(1, "Product Manager", "Acme", "Remote, Israel", "2024-08-02"),
+        _job(2, "Backend Engineer", "Acme", "Remote, Israel", "2024-08-02"),
+    ])
+    with JobArchive(tmp_path / "a.db") as archive:
+        kept = list(job_search.iter_jobs(
+            keywords=["product manager"], scrapers=[("Remotive", "scrape_remotive")], archive=archive))
+        archive.flush()
+        assert [j["link"] for j in kept] == ["http://example.com/1?ref=x"]
+        assert {r["title"] for r in archive.search(site="Remotive")} == {"Product Manager", "Backend Engineer"}
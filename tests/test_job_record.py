@@ -0,0 +1,51 @@
+import pickle
+import sys
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from job_record import Job, canonical
+
+ROW = {
+    "title": "Product Manager",
+    "company": "Acme",
+    "location": "Tel Aviv, Israel",
+    "link": "http://example.com/job1?utm=1",
+    "date": "2024-05-01",
+}
+
+
+def test_job_reads_like_a_dict():
+    job = Job(**ROW)
+    assert job == ROW
+    assert dict(job) == ROW
+    assert job["company"] == "Acme"
+    assert job.get("alt_links", ()) == ()
+    assert job.posted == date(2024, 5, 1)
+    assert canonical(job) == canonical(ROW) == "http://example.com/job1"
+    assert hash(job) == hash(Job(**dict(ROW, title="Other")))
+
+
+def test_alt_links_and_copies():
+    job = Job(**ROW)
+    job.setdefault("alt_links", []).append("http://other.example/1")
+    copy = job.copy()
+    copy["alt_links"].append("http://other.example/2")
+    assert job["alt_links"] == ["http://other.example/1"]
+    assert pickle.loads(pickle.dumps(copy)) == copy
+
+    try:
+        job["title"] = "Changed"
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("fields must be read-only")
+
+
+def test_company_and_location_are_interned():
+    a = Job(**ROW)
+    b = Job(**dict(ROW, company="".join(["Ac", "me"]), location="".join(["Tel Aviv, ", "Israel"])))
+    assert a.company is b.company
+    assert a.location is b.location
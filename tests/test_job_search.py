@@ -1,4 +1,5 @@
 import sys
+import time
 import types
 from pathlib import Path
 
@@ -115,3 +116,121 @@ def test_notify_blocked_once_per_provider(monkeypatch):
 
     job_search.search_jobs()
     assert messages == ["Indeed"]
+
+
+def test_concurrent_merge_keeps_sequential_order(monkeypatch):
+    monkeypatch.setattr(job_search, "time", types.ModuleType("time"))
+    job_search.time.sleep = lambda s: None
+
+    def make(site):
+        def scrape(keyword):
+            return [{
+                "link": f"http://example.com/{keyword}",
+                "title": "Product Manager",
+                "location": f"{site}, Israel",
+            }]
+        return scrape
+
+    monkeypatch.setattr(job_search, "scrape_indeed", make("indeed"))
+    monkeypatch.setattr(job_search, "scrape_linkedin", make("linkedin"))
+    scrapers = [("Indeed", "scrape_indeed"), ("LinkedIn", "scrape_linkedin")]
+
+    jobs = job_search.search_jobs(keywords=["a", "b"], scrapers=scrapers)
+    assert [(j["link"], j["location"]) for j in jobs] == [
+        ("http://example.com/a", "indeed, Israel"),
+        ("http://example.com/b", "indeed, Israel"),
+    ]
+
+
+def test_global_feed_fetched_once_and_filtered(monkeypatch):
+    monkeypatch.setattr(job_search, "time", types.ModuleType("time"))
+    job_search.time.sleep = lambda s: None
+    calls = []
+
+    def feed(keyword):
+        calls.append(keyword)
+        return [
+            {"link": "http://example.com/pm", "title": "Product Manager", "location": "Israel"},
+            {"link": "http://example.com/pmm", "title": "Product Marketing Lead", "location": "Israel"},
+        ]
+
+    monkeypatch.setattr(job_search, "scrape_remotive", feed)
+    scrapers = [job_search.Provider("Remotive", "scrape_remotive", job_search.GLOBAL)]
+
+    jobs = job_search.search_jobs(keywords=["product manager", "staff product manager"], scrapers=scrapers)
+    assert calls == [None]
+    assert [j["link"] for j in jobs] == ["http://example.com/pm"]
+
+
+def test_unordered_stream_and_sequential_mode_agree(monkeypatch):
+    monkeypatch.setattr(job_search, "time", types.ModuleType("time"))
+    job_search.time.sleep = lambda s: None
+
+    def feed(keyword):
+        for n in range(3):
+            yield {"link": f"http://example.com/{keyword}/{n}", "title": "Product Manager", "location": "Israel"}
+
+    monkeypatch.setattr(job_search, "scrape_indeed", feed)
+    monkeypatch.setattr(job_search, "scrape_linkedin", feed)
+    scrapers = [("Indeed", "scrape_indeed"), ("LinkedIn", "scrape_linkedin")]
+
+    sequential = job_search.search_jobs(keywords=["a", "b"], scrapers=scrapers, concurrent=False)
+    streamed = list(job_search.iter_jobs(keywords=["a", "b"], scrapers=scrapers, ordered=False))
+    assert len(sequential) == 6
+    assert sorted(j["link"] for j in streamed) == sorted(j["link"] for j in sequential)
+
+
+def test_worker_failure_outside_scraper_does_not_hang(monkeypatch):
+    messages = []
+    monkeypatch.setattr(job_search, "notify_blocked", lambda site: messages.append(site))
+    monkeypatch.setattr(job_search, "time", types.ModuleType("time"))
+
+    def sleep(seconds):
+        raise RuntimeError("sleep failed")
+
+    job_search.time.sleep = sleep
+
+    def feed(keyword):
+        return [{"link": f"http://example.com/{keyword}", "title": "Product Manager", "location": "Israel"}]
+
+    monkeypatch.setattr(job_search, "scrape_indeed", feed)
+    monkeypatch.setattr(job_search, "scrape_linkedin", lambda kw: [])
+    scrapers = [("Indeed", "scrape_indeed"), ("LinkedIn", "scrape_linkedin")]
+
+    jobs = job_search.search_jobs(keywords=["a", "b"], scrapers=scrapers)
+    assert [j["link"] for j in jobs] == ["http://example.com/a"]
+    assert messages == ["Indeed", "LinkedIn"]
+
+
+def test_get_raises_when_worker_dies_without_done():
+    from concurrent.futures import Future
+
+    future = Future()
+    future.set_exception(ValueError("emit failed"))
+    with pytest.raises(ValueError):
+        job_search._get(job_search.queue.Queue(), [future])
+
+
+def test_ordered_stream_buffers_at_most_queue_size(monkeypatch):
+    monkeypatch.setattr(job_search, "time", types.ModuleType("time"))
+    job_search.time.sleep = lambda s: None
+    monkeypatch.setattr(job_search, "QUEUE_SIZE", 4)
+    produced = {"linkedin": 0}
+
+    def first(keyword):
+        yield {"link": "http://example.com/first", "title": "Product Manager", "location": "Israel"}
+
+    def flood(keyword):
+        for n in range(100):
+            produced["linkedin"] += 1
+            yield {"link": f"http://example.com/{n}", "title": "Product Manager", "location": "Israel"}
+
+    monkeypatch.setattr(job_search, "scrape_indeed", first)
+    monkeypatch.setattr(job_search, "scrape_linkedin", flood)
+    scrapers = [("Indeed", "scrape_indeed"), ("LinkedIn", "scrape_linkedin")]
+
+    stream = job_search.scrape(keywords=["a"], scrapers=scrapers)
+    assert next(stream)["link"] == "http://example.com/first"
+    time.sleep(0.3)
+    assert produced["linkedin"] <= 4 + 2
+    assert len(list(stream)) == 100
@@ -0,0 +1,131 @@
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import job_search
+
+
+class PageResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._data
+
+
+def _item(n, day):
+    return {"title": f"PM {n}", "apply_url": f"http://example.com/{n}", "date_posted": f"2025-06-{day:02d}T08:00:00Z"}
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    monkeypatch.setattr(job_search.sync_state, "STATE_FILE", tmp_path / "state.json")
+    monkeypatch.setattr(job_search, "JOBDATA_INCREMENTAL", True)
+    job_search.sync_state.discard()
+    pages = {}
+    requested = []
+
+    def fake_get(url, ttl=None, **kwargs):
+        requested.append((url, ttl))
+        return PageResponse(pages[url.split("&min_date")[0]])
+
+    monkeypatch.setattr(job_search.http_cache, "get", fake_get)
+    yield pages, requested
+    job_search.sync_state.discard()
+
+
+def _links(jobs):
+    return [j["link"] for j in jobs]
+
+
+def test_second_run_requests_only_newer_and_stops_early(api):
+    pages, requested = api
+    base = job_search.JOBDATA_URL
+    pages[base] = {"results": [_item(2, 2), _item(1, 1)], "next": None}
+    assert _links(job_search.scrape_jobdata_api(None)) == ["http://example.com/2", "http://example.com/1"]
+    assert job_search.sync_state.get(job_search.JOBDATA_MARK) is None  # staged, not saved
+    job_search.sync_state.commit()
+
+    pages[base] = {"results": [_item(3, 3), _item(2, 2)], "next": "/api/jobs/?page=2"}
+    pages["https://jobdataapi.com/api/jobs/?page=2"] = {"results": [_item(1, 1)], "next": "/api/jobs/?page=3"}
+    requested.clear()
+    assert _links(job_search.scrape_jobdata_api(None)) == ["http://example.com/3"]
+    assert requested[0][0].endswith("&min_date=2025-06-02")
+    assert len(requested) == 2
+    job_search.sync_state.commit()
+    assert job_search.sync_state.get(job_search.JOBDATA_MARK).startswith("2025-06-03")
+    assert job_search.sync_state.get(job_search.JOBDATA_CHECKPOINT) is None
+
+
+def test_oldest_first_listing_is_not_cut_short(api):
+    pages, requested = api
+    job_search.sync_state.put(job_search.JOBDATA_MARK, "2025-06-02T08:00:00Z")
+    base = job_search.JOBDATA_URL
+    pages[base] = {"results": [_item(1, 1), _item(2, 2)], "next": "/api/jobs/?page=2"}
+    pages["https://jobdataapi.com/api/jobs/?page=2"] = {"results": [_item(3, 3)], "next": None}
+
+    assert _links(job_search.scrape_jobdata_api(None)) == ["http://example.com/3"]
+
+
+def test_killed_run_resumes_from_checkpoint(api):
+    pages, requested = api
+    base = job_search.JOBDATA_URL
+    page2 = "https://jobdataapi.com/api/jobs/?page=2"
+    pages[base] = {"results": [_item(2, 2)], "next": "/api/jobs/?page=2"}
+    pages[page2] = {"results": [_item(1, 1)], "next": None}
+
+    gen = job_search.scrape_jobdata_api(None)
+    next(gen)
+    next(gen)  # page 2 is fetched only after page 1 is checkpointed
+    gen.close()
+    job_search.sync_state.discard()  # the run died before saving its history
+    assert job_search.sync_state.get(job_search.JOBDATA_CHECKPOINT) == {"pages": [base], "next": page2}
+
+    requested.clear()
+    jobs = _links(job_search.scrape_jobdata_api(None))
+    # Page 1 is replayed from the cache, so its jobs are not lost.
+    assert jobs == ["http://example.com/2", "http://example.com/1"]
+    assert requested == [(base, float("inf")), (page2, None)]
+    job_search.sync_state.commit()
+    assert job_search.sync_state.get(job_search.JOBDATA_CHECKPOINT) is None
+
+
+def test_finished_walk_drops_checkpoint_even_if_run_dies(api):
+    pages, requested = api
+    base = job_search.JOBDATA_URL
+    pages[base] = {"results": [_item(1, 1)], "next": None}
+
+    assert _links(job_search.scrape_jobdata_api(None)) == ["http://example.com/1"]
+    job_search.sync_state.discard()  # died before saving its history
+    assert job_search.sync_state.get(job_search.JOBDATA_CHECKPOINT) is None
+
+    pages[base] = {"results": [_item(2, 2), _item(1, 1)], "next": None}
+    requested.clear()
+    # The page is fetched fresh, not replayed from the cache.
+    assert _links(job_search.scrape_jobdata_api(None)) == ["http://example.com/2", "http://example.com/1"]
+    assert requested == [(base, None)]
+
+
+def test_scoped_run_keeps_its_own_marks(api, monkeypatch):
+    pages, requested = api
+    job_search.sync_state.put(job_search.JOBDATA_MARK, "2025-06-01T08:00:00Z")
+    job_search.sync_state.put("telegram:offset", 7)
+    monkeypatch.setattr(job_search, "MARK_SCOPE", "local")
+    pages[job_search.JOBDATA_URL] = {"results": [_item(2, 2), _item(1, 1)], "next": None}
+
+    # The full run's mark is neither used nor moved.
+    assert _links(job_search.scrape_jobdata_api(None)) == ["http://example.com/2", "http://example.com/1"]
+    job_search.sync_state.commit()
+    assert job_search.sync_state.get(job_search.JOBDATA_MARK) == "2025-06-01T08:00:00Z"
+    assert job_search.sync_state.get("local:" + job_search.JOBDATA_MARK).startswith("2025-06-02")
+    assert job_search.sync_state.get("telegram:offset") == 7
@@ -0,0 +1,57 @@
+import json
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import job_search
+import metrics
+
+
+def test_report_and_prometheus_export(tmp_path):
+    reg = metrics.Registry()
+    reg.count("scrape_jobs_total", 3, site="Indeed")
+    reg.count("scrape_jobs_total", 2, site="Indeed")
+    reg.count("filter_rejected_total", site='Odd "site"\\x')
+    with reg.timer("stage", stage="search"):
+        pass
+    reg.observe("stage", 2.0, stage="search")
+
+    report = reg.report()
+    assert {"name": "scrape_jobs_total", "labels": {"site": "Indeed"}, "value": 5} in report["counters"]
+    timer = report["timers"][0]
+    assert timer["count"] == 2 and timer["max_seconds"] == 2.0
+
+    text = reg.prometheus()
+    assert 'jobbot_scrape_jobs_total{site="Indeed"} 5' in text
+    assert 'site="Odd \\"site\\"\\\\x"' in text
+    assert 'jobbot_stage_seconds_count{stage="search"} 2' in text
+
+
+def test_write_report_emits_json_and_textfile(tmp_path):
+    metrics.reset()
+    metrics.count("digest_jobs_total", 4)
+    out = metrics.write_report(tmp_path / "report.json", tmp_path / "run.prom")
+    assert json.loads(out.read_text())["counters"] == [{"name": "digest_jobs_total", "labels": {}, "value": 4}]
+    assert "jobbot_digest_jobs_total 4" in (tmp_path / "run.prom").read_text()
+
+
+def test_filter_rejections_are_counted_by_reason():
+    metrics.reset()
+    seen = set()
+    job = {"link": "http://example.com/1", "title": "Product Manager", "location": "Israel"}
+    job_search._keep(job, seen)
+    job_search._keep(job, seen)
+    job_search._keep(dict(job, link="http://example.com/2", title="QA Engineer"), seen)
+    job_search._keep(dict(job, link="http://example.com/3", location="Berlin"), seen)
+    counters = {(c["name"], c["labels"].get("reason")): c["value"] for c in metrics.report()["counters"]}
+    assert counters == {
+        ("filter_kept_total", None): 1,
+        ("filter_rejected_total", "dedup"): 1,
+        ("filter_rejected_total", "title"): 1,
+        ("filter_rejected_total", "location"): 1,
+    }
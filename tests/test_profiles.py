@@ -0,0 +1,40 @@
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import job_search
+from profiles import Profile, by_name, scrape_keywords
+
+JOBS = [
+    {"link": "http://example.com/1", "title": "Product Manager", "company": "A", "location": "Tel Aviv, Israel"},
+    {"link": "http://example.com/2", "title": "Growth Product Manager", "company": "B", "location": "Berlin, Germany"},
+    {"link": "http://example.com/3", "title": "Product Designer", "company": "C", "location": "Berlin, Germany"},
+]
+
+
+def test_profiles_filter_one_shared_result_set():
+    israel = Profile("il", Path("il.db"), "IL", "none")
+    berlin = Profile(
+        "berlin", Path("berlin.db"), "DE", "none",
+        keywords=("growth product manager",),
+        allow_titles=("growth product manager",),
+        location="germany",
+    )
+
+    assert [j["link"] for j in israel.select(JOBS)] == ["http://example.com/1"]
+    picked = list(berlin.select(JOBS))
+    assert [j["link"] for j in picked] == ["http://example.com/2"]
+
+    picked[0]["alt_links"] = ["http://example.com/x"]
+    assert "alt_links" not in JOBS[1]
+
+
+def test_scrape_keywords_are_shared():
+    extra = Profile("extra", Path("x.db"), "X", "none", keywords=("product manager", "product lead"))
+    assert scrape_keywords(by_name("global", "local")) == job_search.KEYWORDS
+    assert scrape_keywords([*by_name("global"), extra]) == [*job_search.KEYWORDS, "product lead"]
@@ -0,0 +1,58 @@
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import job_search
+from provider_health import ProviderHealth
+
+
+def _quiet(monkeypatch):
+    monkeypatch.setattr(job_search, "time", types.ModuleType("time"))
+    job_search.time.sleep = lambda s: None
+    monkeypatch.setattr(job_search, "notify_blocked", lambda site: None)
+
+
+def test_open_circuit_skips_remaining_keywords(monkeypatch):
+    _quiet(monkeypatch)
+    calls = []
+
+    def blocked(keyword):
+        calls.append(keyword)
+        raise Exception("403")
+
+    monkeypatch.setattr(job_search, "scrape_indeed", blocked)
+    monkeypatch.setattr(job_search, "scrape_linkedin", lambda kw: [])
+    scrapers = [("Indeed", "scrape_indeed"), ("LinkedIn", "scrape_linkedin")]
+    health = ProviderHealth()
+
+    list(job_search.iter_jobs(keywords=["a", "b", "c"], scrapers=scrapers, health=health))
+    assert calls == ["a"]
+
+    state = health.finish()
+    assert state["Indeed"]["blocked_runs"] == 1
+    assert state["Indeed"]["open_until"] > health.now
+    assert state["LinkedIn"]["blocked_runs"] == 0
+
+
+def test_cooldown_doubles_and_schedule_prefers_high_yield():
+    now = 1_000_000.0
+    health = ProviderHealth({"Glassdoor": {"blocked_runs": 1, "open_until": 0, "yield": 5}}, now=now)
+    health.record("Glassdoor", 0, True)
+    state = health.finish()
+    assert state["Glassdoor"]["open_until"] == now + 2 * 6 * 3600
+
+    health = ProviderHealth(
+        {
+            "Glassdoor": state["Glassdoor"],
+            "Indeed": {"blocked_runs": 0, "open_until": 0, "yield": 2.0},
+            "LinkedIn": {"blocked_runs": 0, "open_until": 0, "yield": 9.0},
+        },
+        now=now,
+    )
+    providers = [job_search.Provider(site, "f") for site in ("Indeed", "Glassdoor", "LinkedIn", "Remotive")]
+    assert [p.site for p in health.schedule(providers)] == ["Remotive", "LinkedIn", "Indeed"]
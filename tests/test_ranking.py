@@ -0,0 +1,54 @@
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import ranking
+from profiles import Profile
+
+PROFILE = Profile("pm", Path("pm.db"), "PM", "none")
+TITLES = [
+    "Sales Manager",
+    "Product Manager",
+    "QA Engineer",
+    "Staff Product Manager",
+    "Product Manager, Machine Learning",
+    "Senior PM",
+    "Product Designer",
+]
+
+
+def _jobs(titles):
+    return [{"title": t, "company": "Acme", "location": "Tel Aviv, Israel", "link": f"http://example.com/{i}"}
+            for i, t in enumerate(titles)]
+
+
+def test_rank_gates_and_orders_by_relevance():
+    ranked = [j["title"] for j in ranking.rank(_jobs(TITLES), PROFILE, top_n=0)]
+    assert ranked == ["Staff Product Manager", "Product Manager", "Senior PM"]
+    assert [j["title"] for j in ranking.rank(_jobs(TITLES), PROFILE, top_n=1)] == ["Staff Product Manager"]
+
+
+def test_preferences_and_cv_move_postings_up():
+    jobs = _jobs(["Product Manager, Growth", "Product Manager, Payments"])
+    plain = ranking.rank(jobs, PROFILE, top_n=0)
+    payments = ranking.rank(jobs, PROFILE._replace(preferences=("payments",)), top_n=0)
+    assert payments[0]["title"] == "Product Manager, Payments"
+    assert ranking.rank(jobs, PROFILE, top_n=0, cv_text="Led growth experiments")[0]["title"] == (
+        "Product Manager, Growth")
+    assert len(plain) == 2
+
+
+def test_numpy_and_python_scores_agree(monkeypatch):
+    pytest.importorskip("numpy")
+    docs = [ranking.document(j) for j in _jobs(TITLES * 50)]
+    weights = ranking.query(PROFILE, "product strategy for payments")
+    vectorized = ranking.bm25(docs, weights)
+    monkeypatch.setattr(ranking, "_numpy", lambda: None)
+    assert ranking.bm25(docs, weights) == pytest.approx(vectorized)
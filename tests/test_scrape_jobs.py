@@ -0,0 +1,77 @@
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import scrape_jobs
+
+
+class Page:
+    def __init__(self, url):
+        self.text = url
+
+    def raise_for_status(self):
+        pass
+
+
+def _fake_site(monkeypatch, pages, fail_host=None):
+    """``pages[host]`` is a list of result pages, each a list of jk ids."""
+    active, peak = {}, {}
+    lock = threading.Lock()
+
+    def get(url, **kwargs):
+        host = urlsplit(url).netloc
+        if host == fail_host:
+            raise ConnectionError("reset")
+        with lock:
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+        time.sleep(0.01)
+        with lock:
+            active[host] -= 1
+        return Page(url)
+
+    def parse_page(url, host, location):
+        start = int(parse_qs(urlsplit(url).query).get("start", ["0"])[0])
+        host_pages = pages[host]
+        ids = host_pages[min(start // scrape_jobs.PAGE_SIZE, len(host_pages) - 1)]
+        return [{"title": "PM", "company": "Acme", "location": location,
+                 "link": f"https://{host}/rc/clk?jk={jk}&from=serp", "region": location} for jk in ids]
+
+    monkeypatch.setattr(scrape_jobs.http_client, "get", get)
+    monkeypatch.setattr(scrape_jobs, "parse_page", parse_page)
+    return peak
+
+
+def test_follows_pagination_and_dedups_across_regions(monkeypatch):
+    full = [f"a{i}" for i in range(10)]
+    peak = _fake_site(monkeypatch, {
+        "uk.indeed.com": [full, ["a10", "shared"], ["a10", "shared"]],
+        "de.indeed.com": [full, [f"b{i}" for i in range(10)], ["b0"]],
+        "nl.indeed.com": [["shared"]],
+    }, fail_host="ca.indeed.com")
+    targets = scrape_jobs.parse_targets(
+        "uk.indeed.com=London;uk.indeed.com=Manchester;de.indeed.com=;nl.indeed.com=NL;ca.indeed.com=Canada")
+
+    rows = list(scrape_jobs.Crawler(max_pages=3, per_host=1).crawl(targets, workers=8))
+    keys = [scrape_jobs.job_key(r["link"]) for r in rows if "error" not in r]
+    errors = [r for r in rows if "error" in r]
+
+    assert len(keys) == len(set(keys))
+    assert set(keys) == {*full, "a10", "shared", *(f"b{i}" for i in range(10))}
+    assert len(errors) == 1 and "ca.indeed.com" in errors[0]["url"]
+    assert peak["uk.indeed.com"] == 1
+
+
+def test_page_urls_and_targets():
+    assert scrape_jobs.parse_targets("www.indeed.com=; de.indeed.com=Berlin") == [
+        ("www.indeed.com", ""), ("de.indeed.com", "Berlin")]
+    assert scrape_jobs.page_url("de.indeed.com", "Berlin", "pm relocation", 20) == (
+        "https://de.indeed.com/jobs?q=pm+relocation&l=Berlin&start=20")
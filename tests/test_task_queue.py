@@ -0,0 +1,123 @@
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import task_queue
+from task_queue import DONE, FAILED, PENDING, RUNNING, PermanentError, TaskQueue
+
+
+def _queue(tmp_path):
+    return TaskQueue(sqlite3.connect(str(tmp_path / "tasks.db"), check_same_thread=False))
+
+
+def test_steps_chain_retry_and_overlap(tmp_path, monkeypatch):
+    monkeypatch.setattr(task_queue, "RETRY_DELAY_SEC", 0)
+    tasks = _queue(tmp_path)
+    for n in (1, 2):
+        assert tasks.add(f"tailor:{n}", "tailor", {"n": n})
+        tasks.add(f"send:{n}", "send", {"n": n}, after=f"tailor:{n}")
+    assert not tasks.add("tailor:1", "tailor", {"n": 1})
+
+    both_tailoring = threading.Barrier(2, timeout=5)
+    flaky = {"tailor:2": 1}
+    sent, done, started = [], [], set()
+
+    def tailor(payload, _):
+        if payload["n"] not in started:
+            started.add(payload["n"])
+            both_tailoring.wait()
+        if flaky.get(f"tailor:{payload['n']}"):
+            flaky[f"tailor:{payload['n']}"] -= 1
+            raise OSError("disk hiccup")
+        return f"cv{payload['n']}.docx"
+
+    tasks.run(
+        {"tailor": tailor, "send": lambda payload, cv: sent.append(cv)},
+        workers=2,
+        on_done=lambda task: done.append((task.key, task.state)),
+    )
+    assert sorted(sent) == ["cv1.docx", "cv2.docx"]
+    assert tasks.get("tailor:2").attempts == 2
+    assert {s for _, s in done} == {DONE} and len(done) == 4
+
+    assert not tasks.add("send:1", "send", {"n": 1})
+    tasks.run({"tailor": tailor, "send": lambda payload, cv: sent.append(cv)})
+    assert len(sent) == 2
+
+
+def test_restart_resumes_but_never_repeats_an_at_most_once_step(tmp_path):
+    tasks = _queue(tmp_path)
+    tasks.add("tailor:1", "tailor", {})
+    tasks.add("email:1", "email", {}, after="tailor:1")
+    tasks.add("tailor:2", "tailor", {})
+    tasks._set("tailor:1", DONE, result='"cv1"')
+    tasks._set("email:1", RUNNING)
+    tasks._set("tailor:2", RUNNING)
+
+    calls = []
+    tasks = _queue(tmp_path)
+    tasks.run({"tailor": lambda p, _: calls.append("tailor"), "email": lambda p, cv: calls.append(cv)},
+              at_most_once=("email",))
+    assert calls == ["tailor"]
+    assert tasks.get("email:1").state == FAILED
+    assert tasks.get("tailor:2").state == DONE
+
+    assert tasks.add("email:1", "email", {}, after="tailor:1")
+    tasks.run({"email": lambda p, cv: calls.append(cv)})
+    assert calls == ["tailor", "cv1"]
+
+
+def test_permanent_error_fails_the_step_and_its_dependents(tmp_path):
+    tasks = _queue(tmp_path)
+    for n in (1, 2, 3):
+        tasks.add(f"email:{n}", "email", {})
+        tasks.add(f"log:{n}", "log", {}, after=f"email:{n}")
+
+    def email(payload, _):
+        raise PermanentError("535 bad credentials")
+
+    failed = []
+    tasks.run({"email": email, "log": lambda p, r: None}, workers=1,
+              on_done=lambda task: failed.append(task.key))
+    assert {t.state for t in tasks.tasks()} == {FAILED}
+    assert sorted(failed) == sorted(t.key for t in tasks.tasks())
+    assert tasks.tasks(PENDING) == []
+
+
+def test_batched_step_gets_every_ready_task_in_one_call(tmp_path, monkeypatch):
+    monkeypatch.setattr(task_queue, "RETRY_DELAY_SEC", 0)
+    tasks = _queue(tmp_path)
+    for n in (1, 2, 3):
+        tasks.add(f"tailor:{n}", "tailor", {"n": n})
+        tasks.add(f"upload:{n}", "upload", {"n": n}, after=f"tailor:{n}")
+
+    calls = []
+    flaky = {2}
+
+    def tailor(items):
+        calls.append(("tailor", [payload["n"] for payload, _ in items]))
+        return [f"cv{payload['n']}.docx" for payload, _ in items]
+
+    def upload(items):
+        calls.append(("upload", [cv for _, cv in items]))
+        outcomes = []
+        for payload, cv in items:
+            if payload["n"] in flaky:
+                flaky.discard(payload["n"])
+                outcomes.append(OSError("album rejected"))
+            else:
+                outcomes.append(None)
+        return outcomes
+
+    tasks.run({"tailor": tailor, "upload": upload}, batch=("tailor", "upload"))
+    assert calls == [
+        ("tailor", [1, 2, 3]),
+        ("upload", ["cv1.docx", "cv2.docx", "cv3.docx"]),
+        ("upload", ["cv2.docx"]),
+    ]
+    assert {t.state for t in tasks.tasks()} == {DONE}
+    assert tasks.get("upload:2").attempts == 2
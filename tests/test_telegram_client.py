@@ -0,0 +1,47 @@
+import asyncio
+import json
+import sys
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+sys.modules.setdefault("requests", types.ModuleType("requests"))
+
+import telegram_client
+
+
+def test_digest_chunks_respect_limit_and_job_boundaries():
+    blocks = [f"{i}. Product Manager — Acme — Israel\nhttp://example.com/{i}" for i in range(200)]
+    chunks = telegram_client.chunk_digest("header", blocks, limit=500)
+    assert all(len(c) <= 500 for c in chunks)
+    assert chunks[0].startswith("header\n0. ")
+    assert "\n".join(chunks) == "\n".join(["header"] + blocks)
+
+
+def test_oversized_block_is_hard_split():
+    chunks = telegram_client.chunk_digest("", ["x" * 25], limit=10)
+    assert chunks == ["x" * 10, "x" * 10, "x" * 5]
+
+
+def test_documents_upload_as_media_groups(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_post(url, data=None, files=None, **kwargs):
+        calls.append((url.rsplit("/", 1)[-1], json.loads(data["media"]) if "media" in data else None, len(files)))
+        return types.SimpleNamespace(raise_for_status=lambda: None)
+
+    monkeypatch.setattr(telegram_client.http_client, "post", fake_post)
+    docs = []
+    for n in range(11):
+        path = tmp_path / f"cv_{n}.docx"
+        path.write_bytes(b"cv")
+        docs.append((path, f"CV {n}"))
+
+    client = telegram_client.AsyncTelegram("http://tg", "42", rate=1000, burst=10)
+    asyncio.run(client.send_documents(docs))
+
+    assert sorted((method, count) for method, _, count in calls) == [("sendDocument", 1), ("sendMediaGroup", 10)]
+    group = next(media for method, media, _ in calls if method == "sendMediaGroup")
+    assert group[0] == {"type": "document", "media": "attach://doc0", "caption": "CV 0"}
@@ -0,0 +1,42 @@
+import difflib
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from title_matcher import TitleMatcher
+
+ALLOW = ["product manager", "staff product manager", "principal product manager"]
+BLOCK = ["engineer", "designer", "machine learning"]
+
+
+def naive(title, threshold=0.7):
+    t = title.lower()
+    if any(b in t for b in BLOCK):
+        return False
+    return max(difflib.SequenceMatcher(None, t, a).ratio() for a in ALLOW) >= threshold
+
+
+def test_matches_sequence_matcher_semantics():
+    titles = [
+        "Product Manager",
+        "Senior Product Manager",
+        "Staff Product Manager, Payments",
+        "Product Owner",
+        "Product Marketing Manager",
+        "Principal PM",
+        "Machine Learning Product Manager",
+        "Software Engineer",
+        "Project Manager",
+        "VP Product",
+        "",
+    ]
+    matcher = TitleMatcher(ALLOW, BLOCK)
+    assert matcher.classify(titles) == [naive(t) for t in titles]
+
+
+def test_repeated_titles_are_memoized():
+    matcher = TitleMatcher(ALLOW, BLOCK)
+    assert matcher.classify(["Product Manager"] * 3) == [True] * 3
+    assert list(matcher._memo) == ["product manager"]
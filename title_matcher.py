@@ -0,0 +1,79 @@
+"""Precompiled title allow/block matcher.
+
+Gives the same answers as scanning the block list and running one
+``difflib.SequenceMatcher(None, title, allow).ratio()`` per allow title, but
+compiles the block list into one regex, reuses a SequenceMatcher per allow
+title (difflib caches the analysis of the second sequence) and skips the full
+ratio whenever a cheap upper bound already rules the pair out.
+
+This deliberately stops short of a normalized-token / n-gram index: such an
+index would change which titles pass, while these bounds keep the answers
+identical to the original matcher. Titles such as "Senior Product Manager"
+still pass the bounds and pay for a full ratio; the per-title memo is what
+makes repeated titles cheap.
+"""
+
+import difflib
+import re
+import threading
+from functools import lru_cache
+
+MEMO_SIZE = 50_000
+
+
+class TitleMatcher:
+    def __init__(self, allow_titles, block_keywords, threshold=0.7):
+        self.threshold = threshold
+        blocks = sorted(set(block_keywords), key=len, reverse=True)
+        self._block = re.compile("|".join(map(re.escape, blocks))) if blocks else None
+        self._exact = set(allow_titles)
+        self._allow = [(len(a), difflib.SequenceMatcher(None, "", a)) for a in self._exact]
+        self._memo = {}
+        self._lock = threading.Lock()
+
+    def _passes_fuzzy(self, t: str) -> bool:
+        if t in self._exact:
+            return True
+        lt = len(t)
+        for la, matcher in self._allow:
+            # ratio() == 2*M/T can never exceed 2*min(len)/T.
+            if 2.0 * min(lt, la) / (lt + la) < self.threshold:
+                continue
+            matcher.set_seq1(t)
+            if (
+                matcher.real_quick_ratio() >= self.threshold
+                and matcher.quick_ratio() >= self.threshold
+                and matcher.ratio() >= self.threshold
+            ):
+                return True
+        return False
+
+    def _classify(self, t: str) -> bool:
+        if self._block is not None and self._block.search(t):
+            return False
+        return bool(self._allow) and self._passes_fuzzy(t)
+
+    def allowed(self, title: str) -> bool:
+        t = title.lower()
+        with self._lock:
+            hit = self._memo.get(t)
+            if hit is None:
+                hit = self._classify(t)
+                if len(self._memo) >= MEMO_SIZE:
+                    self._memo.clear()
+                self._memo[t] = hit
+        return hit
+
+    def classify(self, titles):
+        """Return one allow/deny flag per title, evaluating each distinct title once."""
+        return [self.allowed(t) for t in titles]
+
+
+@lru_cache(maxsize=32)
+def _cached_matcher(allow_titles, block_keywords, threshold):
+    return TitleMatcher(allow_titles, block_keywords, threshold)
+
+
+def get_matcher(allow_titles, block_keywords, threshold=0.7) -> TitleMatcher:
+    """Return a shared matcher for this allow/block configuration."""
+    return _cached_matcher(tuple(allow_titles), tuple(block_keywords), threshold)